@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Versioned registry of hot-swappable artifacts (career model, taxonomy).
+
+Each artifact is registered with the files it is built from and a loader.
+reload() rebuilds only the artifacts whose files changed, one at a time,
+and publishes a new immutable ArtifactSet with a single reference swap. A
+session takes the current set when it starts and keeps using it, so
+in-flight sessions finish on the old version while new ones get the new
+one; the old set is freed when its last session drops it. watch() polls
+the files from a background thread.
+"""
+
+import os
+import threading
+
+POLL_INTERVAL = 2.0  # seconds between file checks in watch()
+
+
+def fingerprint(paths) -> tuple:
+    """(mtime_ns, size) of every file; missing files count as (0, 0)."""
+    stats = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stats.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stats.append((0, 0))
+    return tuple(stats)
+
+
+class ArtifactSet:
+    """Immutable snapshot of loaded artifacts; index it by artifact name."""
+
+    def __init__(self, version, artifacts, fingerprints):
+        self.version = version
+        self._artifacts = dict(artifacts)
+        self.fingerprints = dict(fingerprints)
+
+    def __getitem__(self, name):
+        return self._artifacts[name]
+
+    def __contains__(self, name):
+        return name in self._artifacts
+
+
+class ArtifactRegistry:
+    """Named artifacts with their source files and loaders."""
+
+    def __init__(self):
+        self._sources = {}
+        self._current = ArtifactSet(0, {}, {})
+        self._load_lock = threading.Lock()  # one load at a time bounds memory to old set + one artifact
+        self._watcher = None
+        self._stop = threading.Event()
+        self._failed = {}  # name -> fingerprint of files that failed to load, not retried until they change
+        self.last_error = None
+
+    def register(self, name, paths, loader):
+        """Add an artifact built by loader() from paths; it is loaded on the next reload()."""
+        self._sources[name] = (list(paths), loader)
+
+    def current(self) -> ArtifactSet:
+        """The live set; loads everything on first use. Sessions should hold on to the result."""
+        if self._current.version == 0:
+            self.reload()
+        return self._current
+
+    def reload(self) -> bool:
+        """Load changed artifacts and swap in a new set; True if a new version was published.
+
+        A failing loader leaves that artifact on its old version and records last_error.
+        """
+        with self._load_lock:
+            old = self._current
+            artifacts = dict(old._artifacts)
+            fingerprints = dict(old.fingerprints)
+            changed = False
+            for name, (paths, loader) in self._sources.items():
+                stamp = fingerprint(paths)
+                if (name in artifacts and fingerprints.get(name) == stamp) or self._failed.get(name) == stamp:
+                    continue
+                try:
+                    artifacts[name] = loader()
+                except Exception as e:
+                    self._failed[name] = stamp
+                    self.last_error = f"{name}: {e}"
+                    continue
+                self._failed.pop(name, None)
+                # Taken after loading, since a loader may rewrite its own files (e.g. recompiling)
+                fingerprints[name] = fingerprint(paths)
+                changed = True
+            if changed or old.version == 0:
+                self._current = ArtifactSet(old.version + 1, artifacts, fingerprints)
+            return changed
+
+    def watch(self, interval=POLL_INTERVAL):
+        """Reload in a daemon thread whenever a watched file changes."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                if any(fingerprint(paths) not in (self._current.fingerprints.get(name), self._failed.get(name))
+                       for name, (paths, _) in self._sources.items()):
+                    self.reload()
+
+        self._watcher = threading.Thread(target=loop, name="artifact-watch", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
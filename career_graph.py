@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Career transition graph with precomputed distances.
+
+Careers are linked when O*NET lists them as related occupations (from the
+Related Occupations file when available), when they share a category in
+the career mapping, or when their skill requirements are close. Components
+left apart are then joined through their most similar skill profiles, so
+every career with skill data can reach every other. The graph is stored as
+CSR arrays together with all-pairs weighted distances, predecessors and hop
+counts, so a shortest path or a "within N steps" query is a few array
+lookups. Its meta records digests of the taxonomy, skill requirements and
+Related Occupations file it was built from; a change to any of them
+triggers a rebuild.
+
+Run `python career_graph.py` to rebuild the graph.
+"""
+
+import csv
+import hashlib
+import json
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, shortest_path
+
+from skill_gap import ONET_SKILLS_PATH, SkillGapEngine
+from taxonomy import load_taxonomy
+
+load_dotenv()
+ONET_RELATED_PATH = os.getenv("ONET_RELATED_PATH", os.path.join("data", "onet_related_occupations.txt"))
+GRAPH_PATH = "career_graph.npz"
+
+RELATED_COSTS = {"Primary-Short": 1.0, "Primary-Long": 1.5, "Supplemental": 2.0}
+SHARED_CATEGORY_COST = 1.0   # divided by the number of categories two careers share
+SKILL_SIMILARITY_MIN = 0.9   # cosine similarity of weighted skill requirements
+SKILL_EDGE_COST = 2.0        # cost at the minimum similarity; falls to 0.5 for identical profiles
+
+
+def _related_edges(path, soc_codes):
+    by_code = {}
+    for career, code in soc_codes.items():
+        by_code.setdefault(code, []).append(career)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f, delimiter="\t"):
+            sources = by_code.get(row.get("O*NET-SOC Code", ""), [])
+            targets = by_code.get(row.get("Related O*NET-SOC Code", ""), [])
+            cost = RELATED_COSTS.get(row.get("Relatedness Tier"), max(RELATED_COSTS.values()))
+            for a in sources:
+                for b in targets:
+                    yield a, b, cost
+
+
+def _skill_similarity(engine):
+    """(careers, careers) cosine similarity of importance-weighted skill requirements."""
+    profiles = engine.required * engine.importance
+    profiles = profiles / np.maximum(np.linalg.norm(profiles, axis=1, keepdims=True), 1e-12)
+    return profiles @ profiles.T
+
+
+def _skill_cost(similarity):
+    """SKILL_EDGE_COST at SKILL_SIMILARITY_MIN, 0.5 for identical profiles, more below the minimum."""
+    return 0.5 + (SKILL_EDGE_COST - 0.5) * (1.0 - similarity) / (1.0 - SKILL_SIMILARITY_MIN)
+
+
+def _sources(taxonomy, related_path, engine) -> dict:
+    """Digests of what the graph is built from, stored in its meta."""
+    related = None
+    if related_path and os.path.exists(related_path):
+        with open(related_path, "rb") as f:
+            related = hashlib.sha1(f.read()).hexdigest()[:16]
+    return {"taxonomy": taxonomy.digest, "skills": engine.version, "related": related}
+
+
+def _edges(taxonomy, related_path, engine):
+    """(career a, career b, cost) from every source; the cheapest cost per pair wins later."""
+    if related_path and os.path.exists(related_path):
+        yield from _related_edges(related_path, taxonomy.soc_codes)
+    shared = {}
+    for careers in taxonomy.career_mapping.values():
+        for i, a in enumerate(careers):
+            for b in careers[i + 1:]:
+                if a != b:
+                    key = tuple(sorted((a, b)))
+                    shared[key] = shared.get(key, 0) + 1
+    for (a, b), n in shared.items():
+        yield a, b, SHARED_CATEGORY_COST / n
+    if len(engine.careers) > 1:
+        similarity = _skill_similarity(engine)
+        for i, j in zip(*np.nonzero(np.triu(similarity >= SKILL_SIMILARITY_MIN, k=1))):
+            yield engine.careers[i], engine.careers[j], _skill_cost(similarity[i, j])
+
+
+def _bridges(cost, index, engine) -> dict:
+    """{(i, j): cost} skill links joining the components of the graph in cost, most similar pairs first.
+
+    Careers without skill data cannot be bridged and stay apart.
+    """
+    n = len(index)
+    pairs = np.array(list(cost), dtype=np.int32).reshape(-1, 2)
+    adjacency = csr_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    n_components, labels = connected_components(adjacency, directed=False)
+    known = [k for k, c in enumerate(engine.careers) if c in index]
+    if n_components == 1 or len(known) < 2:
+        return {}
+    similarity = _skill_similarity(engine)[np.ix_(known, known)]
+    nodes = np.array([index[engine.careers[k]] for k in known])
+    parent = list(range(n_components))
+
+    def find(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    upper = np.triu_indices(len(known), k=1)
+    bridges = {}
+    for p in np.argsort(-similarity[upper], kind="stable"):
+        i, j = upper[0][p], upper[1][p]
+        a, b = find(labels[nodes[i]]), find(labels[nodes[j]])
+        if a != b:
+            parent[a] = b
+            key = (min(nodes[i], nodes[j]), max(nodes[i], nodes[j]))
+            bridges[(int(key[0]), int(key[1]))] = float(_skill_cost(similarity[i, j]))
+            if len(bridges) == n_components - 1:
+                break
+    return bridges
+
+
+def build_graph(path=GRAPH_PATH, related_path=ONET_RELATED_PATH, taxonomy=None, engine=None):
+    """Build the graph and its distance tables and save them; returns the CareerGraph."""
+    taxonomy = taxonomy or load_taxonomy()
+    engine = engine or SkillGapEngine(ONET_SKILLS_PATH, taxonomy)
+    names = sorted(taxonomy.soc_codes)
+    index = {c: i for i, c in enumerate(names)}
+    cost = {}
+    for a, b, c in _edges(taxonomy, related_path, engine):
+        if a in index and b in index and a != b:
+            key = (min(index[a], index[b]), max(index[a], index[b]))
+            cost[key] = min(cost.get(key, np.inf), c)
+    bridges = _bridges(cost, index, engine)
+    cost.update(bridges)
+    pairs = np.array(list(cost), dtype=np.int32).reshape(-1, 2)
+    weights = np.array(list(cost.values()), dtype=np.float32)
+    # Symmetric CSR adjacency
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    adjacency = csr_matrix((np.concatenate([weights, weights]), (rows, cols)), shape=(len(names), len(names)))
+    dist, pred = shortest_path(adjacency, method="D", directed=False, return_predecessors=True)
+    hops = shortest_path(adjacency, method="D", directed=False, unweighted=True)
+    n_components = connected_components(adjacency, directed=False)[0]
+    meta = {"sources": _sources(taxonomy, related_path, engine), "edges": len(weights),
+            "bridges": len(bridges), "components": int(n_components)}
+    np.savez_compressed(
+        path, names=np.array(names, dtype=str), indptr=adjacency.indptr.astype(np.int32),
+        indices=adjacency.indices.astype(np.int32), weights=adjacency.data.astype(np.float32),
+        dist=dist.astype(np.float32), pred=pred.astype(np.int32),
+        hops=np.where(np.isinf(hops), -1, hops).astype(np.int16),
+        meta=np.array(json.dumps(meta)))
+    return CareerGraph(path)
+
+
+class CareerGraph:
+    """CSR adjacency plus all-pairs distances, predecessors and hop counts."""
+
+    def __init__(self, path=GRAPH_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            a = {k: data[k] for k in data.files}
+        self.names = a["names"].tolist()
+        self.index = {c: i for i, c in enumerate(self.names)}
+        self.indptr, self.indices, self.weights = a["indptr"], a["indices"], a["weights"]
+        self.dist, self.pred, self.hops = a["dist"], a["pred"], a["hops"]
+        self.meta = json.loads(str(a["meta"]))
+
+    def neighbours(self, career) -> list:
+        i = self.index[career]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return [(self.names[j], float(w)) for j, w in zip(self.indices[start:end], self.weights[start:end])]
+
+    def reachable(self, source, target) -> bool:
+        """Whether both careers are in the graph and connected."""
+        return (source in self.index and target in self.index
+                and self.hops[self.index[source], self.index[target]] >= 0)
+
+    def path(self, source, target) -> list:
+        """Cheapest chain of careers from source to target; [] if unreachable or unknown (see reachable())."""
+        if source not in self.index or target not in self.index:
+            return []
+        i, j = self.index[source], self.index[target]
+        if i != j and self.pred[i, j] < 0:
+            return []
+        steps = [j]
+        while steps[-1] != i:
+            steps.append(int(self.pred[i, steps[-1]]))
+        return [self.names[k] for k in reversed(steps)]
+
+    def distance(self, source, target) -> float:
+        return float(self.dist[self.index[source], self.index[target]])
+
+    def within(self, careers, steps=2) -> list:
+        """Careers reachable within `steps` hops of any of the given careers, nearest first, excluding them."""
+        rows = [self.index[c] for c in careers if c in self.index]
+        if not rows:
+            return []
+        hops = np.where(self.hops[rows] < 0, np.iinfo(np.int16).max, self.hops[rows]).min(axis=0)
+        dist = self.dist[rows].min(axis=0)
+        found = np.flatnonzero((hops > 0) & (hops <= steps))
+        found = found[~np.isin(found, rows)]
+        return [self.names[k] for k in found[np.argsort(dist[found], kind="stable")]]
+
+
+def get_career_graph(path=GRAPH_PATH, taxonomy=None, engine=None, related_path=ONET_RELATED_PATH) -> CareerGraph:
+    """The saved graph, rebuilt first if missing or built from a different taxonomy,
+    skill requirements or Related Occupations file.
+
+    Not cached here: the counselor registers it as an artifact so a new taxonomy
+    is picked up without a restart.
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    engine = engine or SkillGapEngine(ONET_SKILLS_PATH, taxonomy)
+    if os.path.exists(path):
+        graph = CareerGraph(path)
+        if graph.meta.get("sources") == _sources(taxonomy, related_path, engine):
+            return graph
+    return build_graph(path, related_path, taxonomy, engine)
+
+
+if __name__ == "__main__":
+    import sys
+
+    graph = build_graph()
+    print(f"Built career graph: {len(graph.names)} careers, {graph.meta['edges']} links "
+          f"({graph.meta['bridges']} joining components), {graph.meta['components']} component(s) -> {GRAPH_PATH}")
+    if len(sys.argv) == 3:
+        source, target = sys.argv[1], sys.argv[2]
+        unknown = [c for c in (source, target) if c not in graph.index]
+        if unknown:
+            print(f"Unknown career: {', '.join(unknown)}")
+        elif not graph.reachable(source, target):
+            print(f"No path: {source} and {target} are in different components")
+        else:
+            print(" -> ".join(graph.path(source, target)))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Data-driven career clusters from stored sessions.
+
+MiniBatchKMeans is fitted with partial_fit over chunks of the session store,
+resuming from the last byte offset like the cohort norms, so the history is
+never held in memory. Each cluster is labelled by the categories its centre
+raises most above the cohort mean and keeps running counts of the careers
+its students chose; a session without a choice spreads one count over its
+top recommendations by rank. A new student is assigned by distance to the
+k centres.
+
+Run `python cohort_clusters.py` to fold new sessions in and print the clusters.
+"""
+
+import os
+
+import joblib
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from session_model import get_schema
+from response_quality import MIN_QUALITY_WEIGHT
+from session_store import SESSIONS_PATH, iter_sessions, score_matrix, session_careers, session_choice, session_weight
+
+CLUSTERS_PATH = "cohort_clusters.pkl"
+N_CLUSTERS = 8
+CHUNK_ROWS = 10000
+NEUTRAL_SCORE = 3.0     # fills categories a session did not answer
+MIN_CLUSTER_SESSIONS = 100
+LABEL_CATEGORIES = 3
+RANKED_CAREERS = 3      # recommendations counted for a session without a chosen career
+
+
+def career_votes(record) -> list:
+    """(career, weight) pairs summing to 1: the chosen career, else the top
+    recommendations weighted 1/rank."""
+    chosen = session_choice(record)
+    if chosen:
+        return [(chosen, 1.0)]
+    careers = session_careers(record)[:RANKED_CAREERS]
+    total = sum(1.0 / (rank + 1) for rank in range(len(careers)))
+    return [(career, 1.0 / (rank + 1) / total) for rank, career in enumerate(careers)]
+
+
+class CohortClusters:
+    """Streaming k-means over category score vectors with per-cluster career counts."""
+
+    def __init__(self, categories=None, n_clusters=N_CLUSTERS):
+        self.categories = list(categories or get_schema().layout.categories)
+        self.n_clusters = n_clusters
+        self.model = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=3)
+        self.careers = []
+        self.career_counts = np.zeros((n_clusters, 0), dtype=np.float64)
+        self.score_sum = np.zeros(len(self.categories))
+        self.n_sessions = 0
+        self.store_offset = 0
+        self._pending = []  # sessions held back until there are enough for the first fit
+
+    @property
+    def fitted(self):
+        return hasattr(self.model, "cluster_centers_")
+
+    def _vectors(self, records):
+        _, matrix = score_matrix(records, self.categories)
+        return np.where(np.isnan(matrix), NEUTRAL_SCORE, matrix)
+
+    def _count_careers(self, labels, records):
+        index = {c: j for j, c in enumerate(self.careers)}
+        rows, cols, votes = [], [], []
+        for label, record in zip(labels, records):
+            for career, vote in career_votes(record):
+                if career not in index:
+                    index[career] = len(self.careers)
+                    self.careers.append(career)
+                rows.append(label)
+                cols.append(index[career])
+                votes.append(vote)
+        # Clusters saved before counts were weighted hold integers
+        self.career_counts = self.career_counts.astype(np.float64, copy=False)
+        if self.career_counts.shape[1] < len(self.careers):
+            grow = len(self.careers) - self.career_counts.shape[1]
+            self.career_counts = np.hstack([self.career_counts, np.zeros((self.n_clusters, grow))])
+        np.add.at(self.career_counts, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)),
+                  np.array(votes, dtype=np.float64))
+
+    def update(self, records):
+        """Fold a chunk of session records into the centres and career counts."""
+        records = self._pending + list(records)
+        if not self.fitted and len(records) < self.n_clusters:
+            self._pending = records
+            return
+        self._pending = []
+        X = self._vectors(records)
+        self.model.partial_fit(X)
+        self._count_careers(self.model.predict(X), records)
+        self.score_sum += X.sum(axis=0)
+        self.n_sessions += len(records)
+
+    def update_from_store(self, path=SESSIONS_PATH, chunk_rows=CHUNK_ROWS):
+        """Fold in only the sessions appended since the last update, a chunk at a time.
+
+        Sessions screened as careless (weight below MIN_QUALITY_WEIGHT) are skipped.
+        """
+        chunk, added = [], 0
+        for record, offset in iter_sessions(path, self.store_offset):
+            self.store_offset = offset
+            if session_weight(record) < MIN_QUALITY_WEIGHT:
+                continue
+            chunk.append(record)
+            if len(chunk) == chunk_rows:
+                self.update(chunk)
+                added, chunk = added + len(chunk), []
+        if chunk:
+            self.update(chunk)
+            added += len(chunk)
+        return added
+
+    def assign(self, scores: dict) -> int:
+        """Nearest cluster for one {category: score} dict; O(k) distances."""
+        values = [scores.get(c) for c in self.categories]
+        x = np.array([v if isinstance(v, (int, float)) else NEUTRAL_SCORE for v in values])
+        return int(np.argmin(((self.model.cluster_centers_ - x) ** 2).sum(axis=1)))
+
+    def label(self, cluster: int) -> str:
+        """The categories this cluster's centre raises most above the cohort mean."""
+        lift = self.model.cluster_centers_[cluster] - self.score_sum / max(self.n_sessions, 1)
+        top = np.argsort(-lift)[:LABEL_CATEGORIES]
+        return " / ".join(self.categories[i] for i in top if lift[i] > 0) or "Balanced profile"
+
+    def cluster_careers(self, cluster: int, top=3) -> list:
+        """Careers most often chosen (or, without a choice, ranked highest) by students in a cluster."""
+        counts = self.career_counts[cluster]
+        order = np.argsort(-counts, kind="stable")[:top]
+        return [self.careers[j] for j in order if counts[j] > 0]
+
+    def recommend(self, scores: dict, top=3):
+        """(cluster label, careers) for a student, or (None, []) before enough sessions."""
+        if not self.fitted or self.n_sessions < MIN_CLUSTER_SESSIONS:
+            return None, []
+        cluster = self.assign(scores)
+        return self.label(cluster), self.cluster_careers(cluster, top)
+
+    def save(self, path=CLUSTERS_PATH):
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path=CLUSTERS_PATH):
+        return joblib.load(path)
+
+
+def refresh_clusters(store_path=SESSIONS_PATH, clusters_path=CLUSTERS_PATH):
+    """Load the saved clusters, fold in new sessions from the store and save them back."""
+    clusters = CohortClusters.load(clusters_path) if os.path.exists(clusters_path) else CohortClusters()
+    if clusters.update_from_store(store_path):
+        clusters.save(clusters_path)
+    return clusters
+
+
+if __name__ == "__main__":
+    clusters = refresh_clusters()
+    print(f"{clusters.n_sessions} sessions in {clusters.n_clusters} clusters")
+    if clusters.fitted:
+        sizes = clusters.career_counts.sum(axis=1)
+        for k in range(clusters.n_clusters):
+            print(f"  {k}: {clusters.label(k)} ({sizes[k]:.0f} with careers) -> {', '.join(clusters.cluster_careers(k))}")
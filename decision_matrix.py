@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Decision-matrix ranking for the Layer 6 Passion_Practicality ratings.
+
+The "Career N: How ...?" answers are parsed into a careers x criteria array
+and ranked with a weighted sum or TOPSIS. Both methods broadcast over any
+leading axes, so a (students, careers, criteria) cohort array ranks in one
+call.
+"""
+
+import re
+
+import numpy as np
+
+from response_parser import get_parser
+
+CRITERIA = ["passion", "match", "practicality", "accessibility", "sustainability"]
+CRITERION_KEYWORDS = {
+    "passionate": "passion",
+    "match": "match",
+    "practical": "practicality",
+    "accessible": "accessibility",
+    "sustainable": "sustainability",
+}
+DEFAULT_WEIGHTS = {
+    "passion": 0.30,
+    "match": 0.25,
+    "practicality": 0.20,
+    "accessibility": 0.10,
+    "sustainability": 0.15,
+}
+RATING_LOW, RATING_HIGH = 1, 5
+_CAREER_SLOT = re.compile(r"^Career (\d+):")
+_DIGIT = re.compile(r"[1-5]")
+
+
+def parse_rating(answer, scale=None):
+    """Read a 1-5 rating from an answer: a number, a scale label or the first digit in text."""
+    if isinstance(answer, (int, float)) and not isinstance(answer, bool):
+        return float(answer) if RATING_LOW <= answer <= RATING_HIGH else np.nan
+    text = str(answer).strip().lower()
+    if scale:
+        value = get_parser(scale).parse(text)
+        if value is not None:
+            return float(value)
+    found = _DIGIT.search(text)
+    return float(found.group()) if found else np.nan
+
+
+def parse_ratings(answers, questions, n_careers=3, scale=None):
+    """(careers, criteria) array from the Passion_Practicality answers; NaN if unanswered."""
+    matrix = np.full((n_careers, len(CRITERIA)), np.nan)
+    for question, answer in zip(questions, answers):
+        slot = _CAREER_SLOT.match(question)
+        if not slot or not 1 <= int(slot.group(1)) <= n_careers:
+            continue
+        for keyword, criterion in CRITERION_KEYWORDS.items():
+            if keyword in question.lower():
+                matrix[int(slot.group(1)) - 1, CRITERIA.index(criterion)] = parse_rating(answer, scale)
+                break
+    return matrix
+
+
+def weight_vector(weights=None):
+    weights = weights or DEFAULT_WEIGHTS
+    w = np.array([weights.get(c, 0.0) for c in CRITERIA], dtype=np.float64)
+    return w / w.sum()
+
+
+def weighted_sum(matrix, weights=None):
+    """Weighted mean rating per career, re-normalising weights over answered criteria."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    w = weight_vector(weights)
+    answered = ~np.isnan(matrix)
+    total = np.where(answered, matrix, 0.0) @ w
+    used = answered @ w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(used > 0, total / np.where(used > 0, used, 1), np.nan)
+
+
+def topsis(matrix, weights=None):
+    """TOPSIS closeness (0-1) per career; every criterion is a benefit criterion.
+
+    Unanswered criteria count as the scale midpoint so they neither help nor hurt.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    matrix = np.where(np.isnan(matrix), (RATING_LOW + RATING_HIGH) / 2, matrix)
+    norms = np.linalg.norm(matrix, axis=-2, keepdims=True)
+    weighted = matrix / np.where(norms > 0, norms, 1) * weight_vector(weights)
+    best = weighted.max(axis=-2, keepdims=True)
+    worst = weighted.min(axis=-2, keepdims=True)
+    d_best = np.linalg.norm(weighted - best, axis=-1)
+    d_worst = np.linalg.norm(weighted - worst, axis=-1)
+    total = d_best + d_worst
+    return np.where(total > 0, d_worst / np.where(total > 0, total, 1), 0.5)
+
+
+def rank_careers(career_names, matrix, weights=None, method="topsis"):
+    """(career, score) pairs best first for the careers that were actually rated."""
+    matrix = np.asarray(matrix, dtype=np.float64)[:len(career_names)]
+    rated = ~np.isnan(matrix).all(axis=1)
+    if not rated.any():
+        return []
+    scores = topsis(matrix[rated], weights) if method == "topsis" else weighted_sum(matrix[rated], weights)
+    names = [n for n, r in zip(career_names, rated) if r]
+    order = np.argsort(-scores, kind="stable")
+    return [(names[i], float(scores[i])) for i in order]
+
+
+def merge_ranking(careers, ranked):
+    """Reorder the ranked careers among the positions they hold in careers, best first.
+
+    Other careers keep their places; ranked careers missing from the list are appended first.
+    """
+    merged = list(careers) + [c for c in ranked if c not in careers]
+    slots = [i for i, c in enumerate(merged) if c in ranked]
+    for slot, career in zip(slots, ranked):
+        merged[slot] = career
+    return merged
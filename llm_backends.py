@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Pluggable language-model backends for the AI counselor.
+
+Every backend offers complete(prompt, max_tokens, timeout) and
+stream(prompt, max_tokens, timeout); timeout is the request timeout in
+seconds, so callers can pass what is left of the session budget. "openai"
+is the hosted API, "http" any OpenAI-compatible server (llama.cpp server,
+vLLM, ...), "local" an in-process CPU model through llama-cpp-python, and
+"template" a deterministic offline responder that needs no model at all.
+"""
+
+import abc
+import json
+import re
+import time
+
+import openai
+import requests
+
+from prompt_batching import batch_items
+from streaming import openai_token_stream
+
+
+class LLMBackend(abc.ABC):
+    """Base class: stream() defaults to yielding the full completion at once."""
+
+    name = "base"
+
+    @abc.abstractmethod
+    def complete(self, prompt: str, max_tokens: int = 150, timeout=None) -> str:
+        """The model's answer to prompt, at most max_tokens long."""
+
+    def stream(self, prompt: str, max_tokens: int = 150, timeout=None):
+        yield self.complete(prompt, max_tokens, timeout)
+
+
+class OpenAIBackend(LLMBackend):
+    """Hosted OpenAI chat completions."""
+
+    name = "openai"
+
+    def __init__(self, api_key=None, model="gpt-3.5-turbo", api_base=None, timeout=30.0):
+        self.api_key = api_key
+        self.model = model
+        self.api_base = api_base
+        self.timeout = timeout
+
+    def complete(self, prompt, max_tokens=150, timeout=None):
+        openai.api_key = self.api_key
+        kwargs = {"api_base": self.api_base} if self.api_base else {}
+        response = openai.ChatCompletion.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            request_timeout=self.timeout if timeout is None else timeout,
+            **kwargs
+        )
+        return response.choices[0].message.content.strip()
+
+    def stream(self, prompt, max_tokens=150, timeout=None):
+        openai.api_key = self.api_key
+        yield from openai_token_stream(prompt, self.model, max_tokens, self.api_base,
+                                       self.timeout if timeout is None else timeout)
+
+
+class HTTPBackend(LLMBackend):
+    """OpenAI-compatible /v1/chat/completions endpoint, e.g. a local llama.cpp or vLLM server."""
+
+    name = "http"
+
+    def __init__(self, base_url="http://localhost:8080", model="local", api_key=None, timeout=30.0):
+        self.url = base_url.rstrip("/") + "/v1/chat/completions"
+        self.model = model
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _payload(self, prompt, max_tokens, stream):
+        return {"model": self.model, "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens, "stream": stream}
+
+    def complete(self, prompt, max_tokens=150, timeout=None):
+        response = self.session.post(self.url, json=self._payload(prompt, max_tokens, False),
+                                     headers=self.headers, timeout=self.timeout if timeout is None else timeout)
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"].strip()
+
+    def stream(self, prompt, max_tokens=150, timeout=None):
+        with self.session.post(self.url, json=self._payload(prompt, max_tokens, True), headers=self.headers,
+                               timeout=self.timeout if timeout is None else timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                token = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if token:
+                    yield token
+
+
+class LocalBackend(LLMBackend):
+    """In-process CPU model (GGUF file) through llama-cpp-python.
+
+    The timeout is checked between generated tokens: once it has passed,
+    generation stops and TimeoutError is raised. Prompt evaluation before the
+    first token is not interrupted.
+    """
+
+    name = "local"
+
+    def __init__(self, model_path, n_ctx=2048, n_threads=None):
+        try:
+            from llama_cpp import Llama
+        except ImportError as e:
+            raise RuntimeError("The 'local' LLM backend needs llama-cpp-python installed") from e
+        if not model_path:
+            raise RuntimeError("The 'local' LLM backend needs LLM_MODEL_PATH set to a GGUF model file")
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, verbose=False)
+
+    def complete(self, prompt, max_tokens=150, timeout=None):
+        return "".join(self.stream(prompt, max_tokens, timeout)).strip()
+
+    def stream(self, prompt, max_tokens=150, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        chunks = self.llm.create_chat_completion(messages=[{"role": "user", "content": prompt}],
+                                                 max_tokens=max_tokens, stream=True)
+        for chunk in chunks:
+            if deadline is not None and time.monotonic() > deadline:
+                chunks.close()  # stops generation
+                raise TimeoutError(f"Local model did not finish within {timeout:.1f}s")
+            token = chunk["choices"][0].get("delta", {}).get("content")
+            if token:
+                yield token
+
+
+class TemplateBackend(LLMBackend):
+    """Deterministic template answers; understands the batched prompt format."""
+
+    name = "template"
+
+    TEMPLATES = [
+        (re.compile(r"Explain why this question (?:is important in career counseling|matters for career guidance): '?(.+?)'?$", re.S),
+         "This question helps map your preferences to careers: your answer to \"{0}\" shows which kinds of work fit you best."),
+        (re.compile(r"explain why (.+?) could suit a student whose strongest area is (.+?)\.$", re.S),
+         "{0} makes daily use of strengths in {1}, so it builds on what you already do well."),
+    ]
+    DEFAULT = "Take a moment to reflect on your preferences and plans; there is no wrong answer here."
+
+    def _answer(self, prompt):
+        for pattern, template in self.TEMPLATES:
+            m = pattern.search(prompt.strip())
+            if m:
+                return template.format(*m.groups())
+        return self.DEFAULT
+
+    def complete(self, prompt, max_tokens=150, timeout=None):
+        items = batch_items(prompt)
+        if items is not None:
+            return json.dumps([self._answer(item) for item in items])
+        return self._answer(prompt)
+
+    def stream(self, prompt, max_tokens=150, timeout=None):
+        for word in self.complete(prompt, max_tokens).split(" "):
+            yield word + " "
+
+
+def create_backend(llm_config: dict) -> LLMBackend:
+    """Build the backend named by llm_config['backend']."""
+    backend = llm_config.get("backend", "openai")
+    if backend == "openai":
+        return OpenAIBackend(llm_config.get("api_key"), llm_config.get("model", "gpt-3.5-turbo"),
+                             llm_config.get("api_base"), llm_config.get("timeout", 30.0))
+    if backend == "http":
+        return HTTPBackend(llm_config.get("base_url", "http://localhost:8080"), llm_config.get("model", "local"),
+                           llm_config.get("api_key"), llm_config.get("timeout", 30.0))
+    if backend == "local":
+        return LocalBackend(llm_config.get("model_path"), n_threads=llm_config.get("n_threads"))
+    if backend == "template":
+        return TemplateBackend()
+    raise ValueError(f"Unknown LLM backend: {backend}")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Local labor-market data store.
+
+Loads BLS OES wage files and employment projection CSVs into arrays indexed
+by SOC occupation code, precomputes salary and demand percentiles across
+all occupations, and maps every career name to its row once at startup, so
+a lookup is a dict access. Without data files the store falls back to the
+small built-in trend table the scripts used to carry.
+"""
+
+import csv
+import functools
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+
+from taxonomy import load_taxonomy
+
+load_dotenv()
+OES_PATH = os.getenv("MARKET_OES_PATH", os.path.join("data", "oes.csv"))
+PROJECTIONS_PATH = os.getenv("MARKET_PROJECTIONS_PATH", os.path.join("data", "projections.csv"))
+
+# Column names differ between BLS releases; the first one present is used
+OES_COLUMNS = {
+    "code": ["OCC_CODE", "occ_code", "Occupation Code"],
+    "title": ["OCC_TITLE", "occ_title", "Occupation Title"],
+    "employment": ["TOT_EMP", "tot_emp"],
+    "median": ["A_MEDIAN", "a_median"],
+    "pct10": ["A_PCT10", "a_pct10"],
+    "pct90": ["A_PCT90", "a_pct90"],
+}
+PROJECTION_COLUMNS = {
+    "code": ["Occupation Code", "OCC_CODE", "occ_code", "2023 National Employment Matrix code"],
+    "growth": ["Employment Percent Change", "EMP_CHG_PCT", "Employment change, percent, 2023-33"],
+}
+
+# Built-in fallback when no BLS files are available
+SEED_TRENDS = {
+    "Data Science": {"demand": "High", "salary_range": "$80k-$120k"},
+    "Software Development": {"demand": "High", "salary_range": "$90k-$130k"},
+    "Journalism": {"demand": "Moderate", "salary_range": "$40k-$70k"},
+    "Teaching": {"demand": "Stable", "salary_range": "$40k-$60k"},
+}
+UNKNOWN_TREND = {"demand": "Unknown", "salary_range": "N/A"}
+
+
+def soc_key(code: str) -> str:
+    """Normalise 'SOC 15-1252', '15-1252.00' and '15-1252' to the 7-character OES form."""
+    code = code.strip().upper().replace("SOC", "").strip()
+    return code[:7]
+
+
+def _number(text):
+    """Parse a BLS cell; '*', '#' and '**' markers become NaN (or the top-coded wage)."""
+    text = (text or "").replace(",", "").replace("$", "").strip()
+    if text == "#":
+        return 239200.0  # BLS top-codes annual wages at or above this value
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def _column(fieldnames, candidates):
+    for name in candidates:
+        if name in fieldnames:
+            return name
+    return None
+
+
+def _read_csv(path, columns):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        names = {key: _column(reader.fieldnames or [], options) for key, options in columns.items()}
+        if names["code"] is None:
+            raise ValueError(f"{path}: no occupation code column")
+        for row in reader:
+            yield {key: row.get(name) for key, name in names.items() if name}
+
+
+def _percentile_ranks(values):
+    """Percentile rank (0-100) of every value among the non-NaN values."""
+    ranks = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) > 1:
+        order = valid[np.argsort(values[valid], kind="stable")]
+        ranks[order] = np.linspace(0, 100, len(valid))
+    elif len(valid) == 1:
+        ranks[valid] = 50.0
+    return ranks
+
+
+def _demand_label(percentile):
+    if np.isnan(percentile):
+        return "Unknown"
+    if percentile >= 75:
+        return "High"
+    if percentile >= 40:
+        return "Moderate"
+    return "Low"
+
+
+class MarketDataStore:
+    """Occupation arrays indexed by SOC code, with a career name -> row index.
+
+    career_codes maps career names to O*NET-SOC codes; by default the current taxonomy's.
+    """
+
+    def __init__(self, oes_path=None, projections_path=None, career_codes=None):
+        if career_codes is None:
+            career_codes = load_taxonomy().soc_codes
+        rows = {}
+        if oes_path and os.path.exists(oes_path):
+            for rec in _read_csv(oes_path, OES_COLUMNS):
+                code = soc_key(rec["code"] or "")
+                if code and code not in rows:
+                    rows[code] = {"title": rec.get("title") or code,
+                                  "employment": _number(rec.get("employment")),
+                                  "median": _number(rec.get("median")),
+                                  "pct10": _number(rec.get("pct10")),
+                                  "pct90": _number(rec.get("pct90"))}
+        growth = {}
+        if projections_path and os.path.exists(projections_path):
+            for rec in _read_csv(projections_path, PROJECTION_COLUMNS):
+                growth[soc_key(rec["code"] or "")] = _number(rec.get("growth"))
+        for code in growth:
+            rows.setdefault(code, {"title": code, "employment": np.nan, "median": np.nan,
+                                   "pct10": np.nan, "pct90": np.nan})
+
+        self.codes = list(rows)
+        self.row = {code: i for i, code in enumerate(self.codes)}
+        self.titles = [rows[c]["title"] for c in self.codes]
+        self.median = np.array([rows[c]["median"] for c in self.codes], dtype=np.float64)
+        self.pct10 = np.array([rows[c]["pct10"] for c in self.codes], dtype=np.float64)
+        self.pct90 = np.array([rows[c]["pct90"] for c in self.codes], dtype=np.float64)
+        self.growth = np.array([growth.get(c, np.nan) for c in self.codes], dtype=np.float64)
+        self.salary_percentile = _percentile_ranks(self.median)
+        self.demand_percentile = _percentile_ranks(self.growth)
+        self.career_row = {career: self.row[soc_key(code)] for career, code in career_codes.items()
+                           if soc_key(code) in self.row}
+        self._cache = {}
+
+    def lookup(self, career: str) -> dict:
+        """Market record for one career; the built-in table or 'Unknown' if it has no data."""
+        if career in self._cache:
+            return self._cache[career]
+        i = self.career_row.get(career)
+        if i is None:
+            record = dict(SEED_TRENDS.get(career, UNKNOWN_TREND))
+        else:
+            low, high = self.pct10[i], self.pct90[i]
+            record = {
+                "code": self.codes[i],
+                "title": self.titles[i],
+                "demand": _demand_label(self.demand_percentile[i]),
+                "salary_range": "N/A" if np.isnan(low) or np.isnan(high) else f"${low / 1000:.0f}k-${high / 1000:.0f}k",
+                "median_salary": None if np.isnan(self.median[i]) else float(self.median[i]),
+                "salary_percentile": None if np.isnan(self.salary_percentile[i]) else float(self.salary_percentile[i]),
+                "growth_percent": None if np.isnan(self.growth[i]) else float(self.growth[i]),
+                "demand_percentile": None if np.isnan(self.demand_percentile[i]) else float(self.demand_percentile[i]),
+            }
+        self._cache[career] = record
+        return record
+
+    def lookup_many(self, careers) -> dict:
+        """Market records for a list of careers."""
+        return {career: self.lookup(career) for career in careers}
+
+
+@functools.lru_cache(maxsize=1)
+def get_market_store() -> MarketDataStore:
+    """The process-wide store, built from the configured files on first use."""
+    return MarketDataStore(OES_PATH, PROJECTIONS_PATH)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Model selection harness for the career classifier.
+
+Trains candidate models on the stored session dataset (category scores ->
+the career the student chose) with stratified cross-validation. Every
+(candidate, fold) pair runs as its own job in a process pool. Reported per
+candidate: accuracy, top-k hit rate, training time, single-row inference
+latency p50/p99 and pickled model size, so a model can be picked against a
+latency budget. Latency is timed serially in the parent once the pool has
+finished, so folds still training cannot skew it.
+
+Sessions without a chosen career are left out. With --proxy they are
+labelled with their top recommendation instead, which measures agreement
+with the recommender rather than with student outcomes.
+
+Run `python model_harness.py [latency_budget_ms] [--proxy]`.
+"""
+
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from forest_eval import export_forest
+from session_store import SESSIONS_PATH, session_careers, session_choice, training_set
+
+LATENCY_SAMPLES = 200
+
+
+def _random_forest():
+    return RandomForestClassifier(n_estimators=200, random_state=42)
+
+
+def _small_forest():
+    return RandomForestClassifier(n_estimators=50, max_depth=12, random_state=42)
+
+
+def _extra_trees():
+    return ExtraTreesClassifier(n_estimators=200, random_state=42)
+
+
+def _logistic_regression():
+    return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+
+
+# Factories are module-level functions so they pickle into worker processes
+CANDIDATES = {
+    "random_forest": _random_forest,
+    "random_forest_small": _small_forest,
+    "extra_trees": _extra_trees,
+    "logistic_regression": _logistic_regression,
+}
+
+
+def session_label(record, proxy=False):
+    """Training label of a stored session: the chosen career, or with proxy the top recommendation."""
+    if proxy:
+        careers = session_careers(record)
+        return careers[0] if careers else None
+    return session_choice(record)
+
+
+def load_dataset(store_path=SESSIONS_PATH, min_per_class=2, proxy=False):
+    """(categories, X, y, weights) from the session store; careers with too few sessions are dropped.
+
+    Labels are chosen careers (see session_label). Rows and weights come from
+    session_store.training_set, the same preprocessing CareerModel trains on.
+    """
+    categories, X, y, weights = training_set(store_path, lambda r: session_label(r, proxy))
+    names, counts = np.unique(y.astype(str), return_counts=True) if len(y) else ([], [])
+    keep = np.isin(y.astype(str), [n for n, c in zip(names, counts) if c >= min_per_class])
+    return categories, X[keep], y[keep], weights[keep]
+
+
+def _single_row_latencies(predict, X):
+    rows = X[:LATENCY_SAMPLES]
+    latencies = np.empty(len(rows))
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        predict(row[None, :])
+        latencies[i] = time.perf_counter() - start
+    return latencies
+
+
+def _fit(model, X, y, weights):
+    # Pipelines route sample weights to their final step by name
+    if hasattr(model, "steps"):
+        return model.fit(X, y, **{f"{model.steps[-1][0]}__sample_weight": weights})
+    return model.fit(X, y, sample_weight=weights)
+
+
+def _evaluate_fold(name, X, y, weights, train, test, k, keep_model=False):
+    model = CANDIDATES[name]()
+    start = time.perf_counter()
+    _fit(model, X[train], y[train], weights[train])
+    train_time = time.perf_counter() - start
+
+    proba = model.predict_proba(X[test])
+    classes = model.classes_
+    top = classes[np.argsort(-proba, axis=1)[:, :k]]
+    pickled = pickle.dumps(model)
+    result = {
+        "accuracy": float(np.mean(classes[np.argmax(proba, axis=1)] == y[test])),
+        "top_k": float(np.mean((top == y[test][:, None]).any(axis=1))),
+        "train_s": train_time,
+        "size_bytes": len(pickled),
+    }
+    if keep_model:
+        result["model"] = pickled  # timed in the parent after the pool is done
+    return name, result
+
+
+def _latency_row(model, X):
+    """p50/p99 single-row latency in ms, plus the compiled forest's for random forests."""
+    latencies = _single_row_latencies(model.predict, X) * 1000
+    row = {"p50_ms": float(np.percentile(latencies, 50)), "p99_ms": float(np.percentile(latencies, 99))}
+    if isinstance(model, RandomForestClassifier):
+        with tempfile.TemporaryDirectory() as tmp:
+            compiled = _single_row_latencies(export_forest(model, os.path.join(tmp, "forest")).predict, X) * 1000
+        row["compiled_p50_ms"] = float(np.percentile(compiled, 50))
+        row["compiled_p99_ms"] = float(np.percentile(compiled, 99))
+    return row
+
+
+def compare_models(X, y, weights=None, candidates=None, n_splits=5, k=3, n_jobs=None, latency_budget_ms=None):
+    """Cross-validate candidates in parallel; one summary dict per candidate, best accuracy first.
+
+    weights are per-session sample weights (None: all equal), as CareerModel trains with.
+    n_jobs is the number of worker processes (None or -1: one per CPU).
+    """
+    candidates = list(candidates or CANDIDATES)
+    weights = np.ones(len(y)) if weights is None else np.asarray(weights, dtype=float)
+    n_splits = min(n_splits, int(np.unique(y.astype(str), return_counts=True)[1].min()))
+    if n_splits < 2:
+        raise ValueError("Need at least two sessions per career to cross-validate")
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42).split(X, y.astype(str)))
+    workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_evaluate_fold, name, X, y, weights, train, test, k, i == 0)
+                   for name in candidates for i, (train, test) in enumerate(folds)]
+        by_model = {}
+        for future in futures:
+            name, result = future.result()
+            by_model.setdefault(name, []).append(result)
+
+    # Latency is timed one model at a time on the first fold's test rows, with no training running
+    test_rows = X[folds[0][1]]
+    summary = []
+    for name, results in by_model.items():
+        row = {
+            "model": name,
+            "accuracy": float(np.mean([r["accuracy"] for r in results])),
+            f"top{k}": float(np.mean([r["top_k"] for r in results])),
+            "train_s": float(np.mean([r["train_s"] for r in results])),
+            "size_kb": float(np.mean([r["size_bytes"] for r in results])) / 1024,
+        }
+        model = pickle.loads(next(r["model"] for r in results if "model" in r))
+        row.update(_latency_row(model, test_rows))
+        if latency_budget_ms is not None:
+            row["meets_budget"] = min(row["p99_ms"], row.get("compiled_p99_ms", np.inf)) <= latency_budget_ms
+        summary.append(row)
+    return sorted(summary, key=lambda r: r["accuracy"], reverse=True)
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [a for a in sys.argv[1:] if a != "--proxy"]
+    proxy = "--proxy" in sys.argv
+    budget = float(args[0]) if args else None
+    categories, X, y, weights = load_dataset(proxy=proxy)
+    label = "top recommendation (proxy)" if proxy else "chosen career"
+    print(f"{len(y)} sessions labelled by {label}, {len(categories)} categories, {len(set(y))} careers")
+    for row in compare_models(X, y, weights, latency_budget_ms=budget):
+        print("  ".join(f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                        for key, value in row.items()))
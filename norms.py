@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Cohort norms for category scores.
+
+Category means live on the bounded Likert range, so each category keeps a
+fine fixed-bin histogram as its streaming quantile sketch: updates are a
+bincount, sketches merge by addition, and nothing in the history is
+rescanned. Compact quantile tables derived from the sketch turn a raw
+score into a percentile with np.searchsorted.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from response_quality import MIN_QUALITY_WEIGHT
+from session_store import SESSIONS_PATH, iter_sessions, score_matrix, session_weight
+
+NORMS_PATH = "career_norms.npz"
+BINS_PER_POINT = 100    # resolution of the sketch on the Likert scale
+N_QUANTILES = 101       # percentiles 0..100 in the lookup table
+PERCENTILE_THRESHOLD = 80.0
+MIN_NORM_SESSIONS = 30  # below this the fixed 4.0 cut-off is used instead
+
+
+class CategoryNorms:
+    """Per-category score distributions with percentile lookup."""
+
+    def __init__(self, categories, low=1, high=5):
+        self.categories = list(categories)
+        self.low, self.high = low, high
+        self.n_bins = int((high - low) * BINS_PER_POINT) + 1
+        self.counts = np.zeros((len(self.categories), self.n_bins), dtype=np.int64)
+        self.store_offset = 0
+        self._tables = None
+
+    def _add_categories(self, categories):
+        new = [c for c in categories if c not in self.categories]
+        if new:
+            self.categories.extend(new)
+            self.counts = np.vstack([self.counts, np.zeros((len(new), self.n_bins), dtype=np.int64)])
+
+    def update(self, categories, matrix):
+        """Fold a (sessions, categories) score matrix into the sketches."""
+        self._add_categories(categories)
+        matrix = np.asarray(matrix, dtype=np.float64)
+        rows = np.array([self.categories.index(c) for c in categories], dtype=np.intp)
+        answered = ~np.isnan(matrix)
+        bins = np.rint((np.clip(matrix, self.low, self.high) - self.low) * BINS_PER_POINT)
+        flat = rows[np.nonzero(answered)[1]] * self.n_bins + bins[answered].astype(np.intp)
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+        self._tables = None
+
+    def update_from_store(self, path=SESSIONS_PATH):
+        """Fold in only the sessions appended to the store since the last update.
+
+        Sessions screened as careless (weight below MIN_QUALITY_WEIGHT) are skipped.
+        """
+        records = []
+        for record, offset in iter_sessions(path, self.store_offset):
+            if session_weight(record) >= MIN_QUALITY_WEIGHT:
+                records.append(record)
+            self.store_offset = offset
+        if records:
+            self.update(*score_matrix(records))
+        return len(records)
+
+    def merge(self, other):
+        """Add another sketch (e.g. from a different school) into this one."""
+        self._add_categories(other.categories)
+        rows = [self.categories.index(c) for c in other.categories]
+        self.counts[rows] += other.counts
+        self._tables = None
+
+    @property
+    def n_sessions(self):
+        return int(self.counts.sum(axis=1).max()) if len(self.categories) else 0
+
+    @property
+    def tables(self):
+        """(categories, N_QUANTILES) float32 table of the score at each percentile."""
+        if self._tables is None:
+            cdf = np.cumsum(self.counts, axis=1)
+            totals = np.maximum(cdf[:, -1:], 1)
+            targets = np.maximum(np.linspace(0, 1, N_QUANTILES) * totals, 1)
+            idx = np.array([np.searchsorted(c, t, side="left") for c, t in zip(cdf, targets)])
+            idx = np.minimum(idx, self.n_bins - 1).reshape(len(self.categories), N_QUANTILES)
+            self._tables = (self.low + idx / BINS_PER_POINT).astype(np.float32)
+        return self._tables
+
+    @property
+    def version(self) -> str:
+        """Digest of the percentile tables; changes only when a looked-up percentile could."""
+        digest = hashlib.sha1("\n".join(self.categories).encode())
+        digest.update(np.ascontiguousarray(self.tables).tobytes())
+        return digest.hexdigest()[:16]
+
+    def percentiles(self, scores: dict) -> dict:
+        """Percentile (0-100) of every normed numerical score in a scores dict."""
+        known = [(c, v) for c, v in scores.items()
+                 if c in self.categories and isinstance(v, (int, float)) and not isinstance(v, bool)
+                 and self.counts[self.categories.index(c)].any()]
+        if not known:
+            return {}
+        rows = np.array([self.categories.index(c) for c, _ in known])
+        values = np.array([v for _, v in known], dtype=np.float32)
+        # Offset every row into its own band so one searchsorted covers all categories
+        span = np.float32(self.high - self.low + 1)
+        flat = (self.tables + span * np.arange(len(self.categories), dtype=np.float32)[:, None]).ravel()
+        pos = np.searchsorted(flat, values + span * rows, side="right") - rows * N_QUANTILES
+        pct = np.clip(pos - 1, 0, N_QUANTILES - 1) * (100.0 / (N_QUANTILES - 1))
+        return {c: float(p) for (c, _), p in zip(known, pct)}
+
+    def save(self, path=NORMS_PATH):
+        np.savez_compressed(path, categories=np.array(self.categories), counts=self.counts,
+                            tables=self.tables, bounds=np.array([self.low, self.high]),
+                            store_offset=np.array(self.store_offset))
+
+    @classmethod
+    def load(cls, path=NORMS_PATH):
+        data = np.load(path)
+        low, high = data["bounds"].tolist()
+        norms = cls(data["categories"].tolist(), low, high)
+        norms.counts = data["counts"]
+        norms.store_offset = int(data["store_offset"])
+        norms._tables = data["tables"]
+        return norms
+
+
+def refresh_norms(store_path=SESSIONS_PATH, norms_path=NORMS_PATH, low=1, high=5):
+    """Load the saved norms, fold in new sessions from the store and save them back."""
+    norms = CategoryNorms.load(norms_path) if os.path.exists(norms_path) else CategoryNorms([], low, high)
+    if norms.update_from_store(store_path):
+        norms.save(norms_path)
+    return norms
+
+
+def map_to_careers_by_percentile(percentiles: dict, mapping: dict, threshold=PERCENTILE_THRESHOLD) -> list:
+    """Map categories at or above a cohort percentile to career paths, highest percentile first."""
+    best = {}
+    for category, pct in percentiles.items():
+        if pct >= threshold and category in mapping:
+            for career in mapping[category]:
+                best[career] = max(best.get(career, pct), pct)
+    return sorted(best, key=lambda c: (-best[c], c))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Speculative prefetch of AI explanations.
+
+Once a student has asked for help, explanations for the question on
+screen and the next one are requested in background threads and kept in a
+bounded cache, so the next 'help' usually prints an answer that is already
+there. Students who never ask cost no speculative calls, and each session
+starts at most MAX_PREFETCH of them. Work that has not started when the
+layer ends is cancelled; close() at the end of the session stops the pool.
+"""
+
+import contextvars
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_ENTRIES = 32
+PREFETCH_AHEAD = 2  # the current question plus the next one
+MAX_PREFETCH = 6    # speculative fetches started per session
+
+
+class ExplanationPrefetcher:
+    """Bounded question -> Future cache filled by a small thread pool.
+
+    `fetch(question)` returns the explanation text, or None if unavailable.
+    """
+
+    def __init__(self, fetch, max_entries=MAX_ENTRIES, workers=2, max_prefetch=MAX_PREFETCH):
+        self.fetch = fetch
+        self.max_entries = max_entries
+        self.max_prefetch = max_prefetch
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self.futures = OrderedDict()
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def requested(self) -> bool:
+        """Whether help has been asked for yet; prefetching before that is wasted calls."""
+        return self.hits + self.misses > 0
+
+    def prefetch(self, questions):
+        """Start fetching any of the questions not already cached or in flight, within the session cap."""
+        with self._lock:
+            for question in questions:
+                if question in self.futures:
+                    self.futures.move_to_end(question)
+                    continue
+                if self.started >= self.max_prefetch:
+                    break
+                self.started += 1
+                # Run in a copy of the caller's context so the session deadline applies
+                self.futures[question] = self.pool.submit(contextvars.copy_context().run, self.fetch, question)
+                while len(self.futures) > self.max_entries:
+                    _, evicted = self.futures.popitem(last=False)
+                    evicted.cancel()
+
+    def get(self, question, timeout=None):
+        """The prefetched explanation, waiting up to timeout for one in flight; None on a miss."""
+        with self._lock:
+            future = self.futures.get(question)
+        result = None
+        if future is not None and not future.cancelled() and (timeout or future.done()):
+            try:
+                result = future.result(timeout=timeout)
+            except Exception:  # timed out or the fetch failed
+                result = None
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                # A finished miss is dropped so a later prefetch can retry; in-flight work is kept
+                if future is not None and future.done() and self.futures.get(question) is future:
+                    del self.futures[question]
+            else:
+                self.hits += 1
+        return result
+
+    def cancel_pending(self):
+        """Drop work that has not started yet; finished explanations stay cached."""
+        with self._lock:
+            for question, future in list(self.futures.items()):
+                if future.cancel():
+                    del self.futures[question]
+
+    def close(self):
+        """Cancel queued work and stop the worker threads once running fetches return."""
+        self.cancel_pending()
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Request coalescing for the AI counselor.
+
+Prompts submitted within a short window are sent to the model as one
+numbered multi-item request that asks for a JSON array back, and the reply
+is split into one answer per prompt. A session that needs several
+explanations, suggestions and recommendation texts pays for one round trip
+and one shared instruction header instead of one per prompt.
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+BATCH_HEADER = ("Answer each numbered request below independently, in at most {words} words each. "
+                "Reply with only a JSON array of {n} strings, in the same order.")
+BATCH_PREFIX = BATCH_HEADER[:BATCH_HEADER.index("{")]
+_NUMBERED = re.compile(r"^\s*(\d+)[.)]\s+(.*)$")
+
+
+def build_batch_prompt(prompts, words_per_item=100):
+    lines = [BATCH_HEADER.format(words=words_per_item, n=len(prompts))]
+    lines += [f"{i + 1}. {' '.join(p.split())}" for i, p in enumerate(prompts)]
+    return "\n".join(lines)
+
+
+def batch_items(prompt):
+    """The numbered requests inside a prompt built by build_batch_prompt, or None for a plain prompt."""
+    lines = prompt.splitlines()
+    if not lines or not lines[0].startswith(BATCH_PREFIX):
+        return None
+    return [m.group(2) for m in map(_NUMBERED.match, lines[1:]) if m]
+
+
+def split_batch_reply(reply, n):
+    """Answers from a batched reply: a JSON array, else numbered lines; None if it does not split into n."""
+    start, end = reply.find("["), reply.rfind("]")
+    if start != -1 and end > start:
+        try:
+            items = json.loads(reply[start:end + 1])
+            if isinstance(items, list) and len(items) == n:
+                return [str(item).strip() for item in items]
+        except ValueError:
+            pass
+    numbered = {}
+    for line in reply.splitlines():
+        m = _NUMBERED.match(line)
+        if m:
+            numbered[int(m.group(1))] = m.group(2).strip()
+    if sorted(numbered) == list(range(1, n + 1)):
+        return [numbered[i] for i in range(1, n + 1)]
+    return None
+
+
+class PromptBatcher:
+    """Coalesces prompts over a time window into one model call.
+
+    `send(prompt, max_tokens, timeout)` is the backend call returning the reply
+    text; timeout is what is left of the longest wait among the batched callers
+    (None if any caller waits indefinitely), so the request itself stops when
+    nobody is waiting for it any more.
+    """
+
+    def __init__(self, send, window=0.05, max_items=8, max_tokens_per_item=150):
+        self.send = send
+        self.window = window
+        self.max_items = max_items
+        self.max_tokens_per_item = max_tokens_per_item
+        self.calls = 0
+        self.prompts = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def submit(self, prompt: str, timeout=None) -> Future:
+        """Queue a prompt; the future resolves with its answer after the next flush.
+
+        timeout is how long the caller will wait, and bounds the request sent for it.
+        """
+        future = Future()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._pending.append((prompt, future, deadline))
+            self.prompts += 1
+            full = len(self._pending) >= self.max_items
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+        return future
+
+    def ask(self, prompt: str, timeout=None) -> str:
+        return self.submit(prompt, timeout).result(timeout)
+
+    def ask_many(self, prompts, timeout=None) -> list:
+        """Submit several prompts together and wait for all answers."""
+        futures = [self.submit(p, timeout) for p in prompts]
+        self.flush()
+        return [f.result(timeout) for f in futures]
+
+    def flush(self):
+        """Send everything pending now."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if batch:
+            self._send_batch(batch)
+
+    @staticmethod
+    def _remaining(batch):
+        deadlines = [d for _, _, d in batch]
+        if any(d is None for d in deadlines):
+            return None
+        return max(0.0, max(deadlines) - time.monotonic())
+
+    def _send_batch(self, batch):
+        prompts = [p for p, _, _ in batch]
+        try:
+            with self._lock:
+                self.calls += 1
+            if len(batch) == 1:
+                answers = [self.send(prompts[0], self.max_tokens_per_item, self._remaining(batch))]
+            else:
+                reply = self.send(build_batch_prompt(prompts), self.max_tokens_per_item * len(batch),
+                                  self._remaining(batch))
+                answers = split_batch_reply(reply, len(batch))
+                if answers is None:
+                    # The model ignored the format; fall back to one call per prompt
+                    with self._lock:
+                        self.calls += len(batch)
+                    answers = [self.send(p, self.max_tokens_per_item, self._remaining([item]))
+                               for p, item in zip(prompts, batch)]
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), answer in zip(batch, answers):
+            future.set_result(answer)
+
+
+class FakeBackend:
+    """Deterministic local stand-in for the model, for tests and offline runs."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, prompt, max_tokens, timeout=None):
+        self.calls.append(prompt)
+        items = batch_items(prompt)
+        if items is not None:
+            return json.dumps([f"[fake answer] {item}" for item in items])
+        return f"[fake answer] {prompt}"
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Memoized recommendation results keyed by the student's score profile.
+
+Answers are on a 5-point scale, so many students share a profile. Results of
+the expensive steps (career mapping, AI recommendation text, model
+prediction) are cached under a canonical hash of the quantized score vector
+in a bounded LRU. Callers can decline to keep a result (e.g. text produced
+while a dependency was in fallback) so it is recomputed next time. The
+cache is saved to disk as JSON so batch runs and the interactive CLI share
+it; cached values must therefore be JSON types (tuples come back as lists).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+CACHE_PATH = "recommendation_cache.json"
+MAX_ENTRIES = 50000
+QUANTUM = 0.01  # category means are compared at two decimals
+
+
+def profile_key(scores: dict, *extra) -> str:
+    """Canonical hash of the numerical scores, quantized, plus any extra inputs."""
+    quantized = sorted((c, round(v / QUANTUM)) for c, v in scores.items()
+                       if isinstance(v, (int, float)) and not isinstance(v, bool))
+    payload = json.dumps([quantized, [str(e) for e in extra]], separators=(",", ":"))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class RecommendationCache:
+    """Thread-safe bounded LRU with hit/miss counters per namespace."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, path=CACHE_PATH):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = {}
+        self.misses = {}
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, namespace: str, scores: dict, compute, *extra, keep=None):
+        """Return the cached result for this profile or compute and remember it.
+
+        keep, if given, is called with the computed result; a false answer returns it uncached.
+        """
+        key = (namespace, profile_key(scores, *extra))
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits[namespace] = self.hits.get(namespace, 0) + 1
+                return self.entries[key]
+            self.misses[namespace] = self.misses.get(namespace, 0) + 1
+        result = compute()
+        if keep is not None and not keep(result):
+            return result
+        with self._lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def stats(self) -> dict:
+        """Hit/miss counts and hit rate per namespace."""
+        with self._lock:
+            out = {}
+            for ns in set(self.hits) | set(self.misses):
+                hits, misses = self.hits.get(ns, 0), self.misses.get(ns, 0)
+                out[ns] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+            return {"namespaces": out, "entries": len(self.entries), "evictions": self.evictions}
+
+    def summary(self) -> str:
+        """One-line hit/miss report, e.g. for the end of a session or batch run."""
+        stats = self.stats()
+        parts = [f"{ns} {s['hits']}/{s['hits'] + s['misses']} hits" for ns, s in sorted(stats["namespaces"].items())]
+        return (f"Recommendation cache: {', '.join(parts) or 'no lookups'}; "
+                f"{stats['entries']} entries, {stats['evictions']} evicted")
+
+    def load(self):
+        if self.path and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+            with self._lock:
+                self.entries = OrderedDict(((ns, key), value) for ns, key, value in entries[-self.max_entries:])
+
+    def save(self):
+        if self.path:
+            with self._lock:
+                snapshot = [[ns, key, value] for (ns, key), value in self.entries.items()]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+
+
+# Shared process-wide cache; callers load() it at start and save() it at exit
+RECOMMENDATION_CACHE = RecommendationCache()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Offline replay of stored sessions for tuning layer weights and the threshold.
+
+A category recommends its careers when its score, scaled by its layer's
+weight relative to the mean weight, reaches the threshold; with equal
+weights that is map_to_careers' `score >= 4` rule. All stored sessions are
+loaded once as a score matrix and every (weights, threshold) configuration
+is evaluated with broadcast array operations, in chunks of configurations,
+reporting coverage, diversity and agreement with the careers students
+chose. Configurations are ranked by F1 of agreement and precision, so lists
+that recommend nearly every career do not win.
+
+Only layers with a category in the career mapping get a weight: the others
+cannot change a recommendation and are left out of the mean. Weights that
+are multiples of each other give the same recommendations, so the grid keeps
+one row per ratio, scaled to mean 1. With today's mapping that is Layer 1
+(through the intelligence aliases) and the MBTI type in Layer 2.
+
+Run `python replay.py` for a grid search around the current settings.
+"""
+
+import itertools
+
+import numpy as np
+
+from response_quality import MIN_QUALITY_WEIGHT
+from session_store import SESSIONS_PATH, iter_sessions, score_matrix, session_weight
+from taxonomy import load_taxonomy
+
+DEFAULT_LAYER_WEIGHTS = {"Layer 1": 0.30, "Layer 2": 0.25, "Layer 3": 0.25, "Layer 4": 0.20, "Layer 5": 0.25}
+DEFAULT_THRESHOLD = 4.0
+WEIGHT_LEVELS = (0.1, 0.2, 0.3, 0.4)
+THRESHOLDS = np.round(np.arange(3.0, 4.81, 0.1), 2)
+MAX_CAREERS = 10  # longest mean list a ranked configuration may recommend
+MIN_COVERAGE = 0.9  # share of sessions a ranked configuration must give a recommendation
+CHUNK_BYTES = 256 * 1024 * 1024  # bound on the (configs, sessions, careers) block per step
+MBTI_LAYER = "Layer 2"
+
+
+class ReplayData:
+    """Stored sessions as arrays: scores, category -> layer, category -> career mapping, chosen careers.
+
+    layers holds only the layers that have a mapped category. Sessions screened
+    as careless (weight below MIN_QUALITY_WEIGHT) are left out.
+    """
+
+    def __init__(self, store_path=SESSIONS_PATH, taxonomy=None):
+        taxonomy = taxonomy or load_taxonomy()
+        mapping = taxonomy.scoring_mapping()
+        layer_of = {c: layer for layer, cats in taxonomy.layers.items() for c in cats}
+        records = [r for r, _ in iter_sessions(store_path) if session_weight(r) >= MIN_QUALITY_WEIGHT]
+        categories = sorted({c for r in records for c in r.get("q1", {})
+                             if c in mapping and (c in layer_of or c.startswith("MBTI_"))})
+        _, scores = score_matrix(records, categories)
+        self.categories = categories
+        used = {layer_of.get(c, MBTI_LAYER) for c in categories}
+        self.layers = [layer for layer in taxonomy.layers if layer in used]
+        self.category_layer = np.array([self.layers.index(layer_of.get(c, MBTI_LAYER)) for c in categories],
+                                       dtype=np.intp)
+        self.careers = sorted({k for c in categories for k in mapping[c]})
+        career_index = {k: j for j, k in enumerate(self.careers)}
+        self.mapping = np.zeros((len(categories), len(self.careers)), dtype=np.float32)
+        for i, c in enumerate(categories):
+            self.mapping[i, [career_index[k] for k in mapping[c]]] = 1.0
+        self.scores = np.where(np.isnan(scores), -np.inf, scores)
+        self.chosen = np.array([career_index.get(r.get("chosen"), -1) for r in records], dtype=np.intp)
+
+
+def weight_grid(layers, levels=WEIGHT_LEVELS, fixed=None):
+    """(configs, layers) distinct weight ratios from every combination of levels, each scaled to mean 1.
+
+    Layers in fixed keep their value before scaling.
+    """
+    fixed = fixed or {}
+    axes = [[fixed[layer]] if layer in fixed else list(levels) for layer in layers]
+    return distinct_weights(list(itertools.product(*axes)))[0]
+
+
+def distinct_weights(weights):
+    """(distinct rows scaled to mean 1, index of each input row among them)."""
+    weights = np.asarray(weights, dtype=np.float64)
+    scaled = np.round(weights / weights.mean(axis=1, keepdims=True), 6)
+    unique, inverse = np.unique(scaled, axis=0, return_inverse=True)
+    return unique, inverse.ravel()
+
+
+def replay(data: ReplayData, weights, thresholds) -> dict:
+    """Metrics for every (weights row, threshold) pair, as arrays of shape (configs,).
+
+    coverage: sessions with at least one recommendation; mean_careers: list length;
+    diversity: share of careers recommended to anyone; entropy: normalized spread
+    of recommendations over careers; agreement: sessions whose chosen career was
+    recommended (among sessions with a choice); precision: chosen / list length;
+    f1: harmonic mean of agreement and precision. Without chosen careers the
+    last three are 0.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    w = np.repeat(weights, len(thresholds), axis=0)
+    t = np.tile(thresholds, len(weights))
+    # score * (w / mean w) >= t  <=>  score >= t * mean w / w: one cut-off per (config, category)
+    relative = w / w.mean(axis=1, keepdims=True)
+    cutoffs = t[:, None] / np.maximum(relative[:, data.category_layer], 1e-6)
+
+    n, n_careers = len(data.scores), len(data.careers)
+    has_choice = data.chosen >= 0
+    rows = np.flatnonzero(has_choice)
+    out = {name: np.zeros(len(t)) for name in
+           ("coverage", "mean_careers", "diversity", "entropy", "agreement", "precision")}
+    step = max(1, int(CHUNK_BYTES // max(1, n * max(n_careers, len(data.categories)) * 4)))
+    for start in range(0, len(t), step):
+        block = slice(start, start + step)
+        high = (data.scores[None, :, :] >= cutoffs[block, None, :]).astype(np.float32)
+        recommended = (high @ data.mapping) > 0                      # (configs, sessions, careers)
+        counts = recommended.sum(axis=2)
+        freq = recommended.sum(axis=1).astype(np.float64)
+        out["coverage"][block] = (counts > 0).mean(axis=1) if n else 0.0
+        out["mean_careers"][block] = counts.mean(axis=1) if n else 0.0
+        out["diversity"][block] = (freq > 0).mean(axis=1) if n_careers else 0.0
+        p = freq / np.maximum(freq.sum(axis=1, keepdims=True), 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = -np.where(p > 0, p * np.log(p), 0.0).sum(axis=1)
+        out["entropy"][block] = entropy / np.log(n_careers) if n_careers > 1 else 0.0
+        if len(rows):
+            hit = recommended[:, rows, data.chosen[rows]]
+            out["agreement"][block] = hit.mean(axis=1)
+            out["precision"][block] = (hit / np.maximum(counts[:, rows], 1)).mean(axis=1)
+    both = out["agreement"] + out["precision"]
+    out["f1"] = np.where(both > 0, 2 * out["agreement"] * out["precision"] / np.maximum(both, 1e-12), 0.0)
+    out["weights"] = w
+    out["threshold"] = t
+    return out
+
+
+def best_configs(results, min_coverage=MIN_COVERAGE, top=10, metric="f1", max_careers=MAX_CAREERS):
+    """Indices of the best configurations by metric among those meeting the coverage floor
+    and recommending at most max_careers careers on average."""
+    ok = np.flatnonzero((results["coverage"] >= min_coverage) & (results["mean_careers"] <= max_careers))
+    return ok[np.argsort(-results[metric][ok], kind="stable")[:top]]
+
+
+if __name__ == "__main__":
+    import time
+
+    data = ReplayData()
+    n_chosen = int((data.chosen >= 0).sum())
+    print(f"{len(data.scores)} sessions ({n_chosen} with a chosen career), "
+          f"{len(data.categories)} categories, {len(data.careers)} careers, weighted layers: {data.layers}")
+    tunable = len(data.layers) >= 2
+    if not tunable:
+        print(f"Only {len(data.layers)} layer(s) map to careers, so layer weights cannot change a recommendation; "
+              "only the threshold is tuned")
+    # map_to_careers today ignores layer_weights (equal weights); also replay the prototype's weights.
+    # Deduplicated together with the grid so no configuration is replayed or listed twice.
+    baselines = np.array([[1.0] * len(data.layers),
+                          [DEFAULT_LAYER_WEIGHTS.get(layer, 0.25) for layer in data.layers]], dtype=np.float64)
+    weights, row_of = distinct_weights(np.vstack([baselines, weight_grid(data.layers)]))
+    start = time.perf_counter()
+    results = replay(data, weights, THRESHOLDS)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(results['threshold'])} configurations in {elapsed:.2f}s")
+    at_default = int(np.flatnonzero(np.isclose(THRESHOLDS, DEFAULT_THRESHOLD))[0])
+    rows = [("current", row_of[0] * len(THRESHOLDS) + at_default)]
+    if row_of[1] != row_of[0]:
+        rows.append(("weighted", row_of[1] * len(THRESHOLDS) + at_default))
+    else:
+        print("The prototype's layer_weights equal the current equal weights on the mapped layers")
+    if n_chosen:
+        best = best_configs(results)
+        if not len(best):
+            print(f"No configuration covers {MIN_COVERAGE:.0%} of sessions with at most {MAX_CAREERS} careers on average")
+        rows += [("best", i) for i in best]
+    else:
+        print("No session records a chosen career yet, so agreement cannot be measured; not ranking configurations")
+    for label, i in rows:
+        w = {layer: round(float(v), 2) for layer, v in zip(data.layers, results["weights"][i])}
+        print(f"{label:8s} threshold={results['threshold'][i]:.2f} " + (f"weights={w} " if tunable else "")
+              + " ".join(f"{m}={results[m][i]:.3f}" for m in
+                         ("coverage", "mean_careers", "diversity", "entropy", "agreement", "precision", "f1")))
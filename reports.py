@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Per-student career reports for a whole cohort.
+
+Every stored session becomes one HTML (or PDF) report with the student's
+scores, ranked careers, O*NET skills, skill gaps and market data. Skill gaps
+go through the shared recommendation cache, so profiles already seen by the
+CLI or an earlier run are not recomputed. Score charts are written, like the
+stylesheet, to a shared assets/ directory that reports link to instead of
+embedding. Charts and reports are built in a process pool.
+
+Run `python reports.py [out_dir] [--pdf]` to build the pack for the session store.
+"""
+
+import html
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from market_data import get_market_store
+from recommendation_cache import RECOMMENDATION_CACHE
+from session_store import SESSIONS_PATH, iter_sessions, session_careers, session_scores
+from skill_gap import ONET_SKILLS_PATH, SkillGapEngine
+from taxonomy import load_taxonomy
+
+REPORTS_DIR = "reports"
+ASSETS_DIR = "assets"
+REPORTS_PER_TASK = 200  # reports rendered per pool task
+CHARTS_PER_TASK = 20
+MAX_CAREERS = 10
+
+STYLESHEET = """body { font-family: sans-serif; margin: 2em; color: #222; }
+h1 { font-size: 1.6em; } h2 { font-size: 1.2em; margin-top: 1.5em; }
+table { border-collapse: collapse; } td, th { border: 1px solid #ccc; padding: 4px 8px; text-align: left; }
+img { max-width: 100%; }
+"""
+
+_context = {}
+
+
+def _init_worker(context):
+    _context.update(context)
+
+
+def render_chart(scores: dict, path: str):
+    """Bar chart of one profile's numerical category scores."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    names = sorted(scores, key=scores.get, reverse=True)
+    fig, ax = plt.subplots(figsize=(8, max(3, 0.25 * len(names))))
+    ax.barh(names[::-1], [scores[n] for n in names[::-1]], color="steelblue")
+    ax.set_xlim(1, 5)
+    ax.set_title("Category Scores")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def _render_charts(jobs):
+    return [render_chart(scores, path) for scores, path in jobs]
+
+
+def render_report(student_id: str, scores: dict, careers: list, chart: str, development: dict) -> str:
+    """HTML for one student; chart (None if no scores) and stylesheet are relative links into assets/."""
+    onet, market = _context["onet"], _context["market"]
+    esc = html.escape
+    score_rows = "".join(f"<tr><td>{esc(c)}</td><td>{v:.2f}</td></tr>"
+                         for c, v in sorted(scores.items(), key=lambda kv: kv[1], reverse=True))
+    career_rows = []
+    for rank, career in enumerate(careers[:MAX_CAREERS], 1):
+        info = onet.get(career, {})
+        trend = market.get(career, {})
+        career_rows.append(
+            f"<tr><td>{rank}</td><td>{esc(career)}</td>"
+            f"<td>{esc(', '.join(info.get('skills', [])) or 'N/A')}</td>"
+            f"<td>{esc(info.get('outlook', 'N/A'))}</td>"
+            f"<td>{esc(trend.get('demand', 'Unknown'))}</td>"
+            f"<td>{esc(trend.get('salary_range', 'N/A'))}</td>"
+            f"<td>{esc(', '.join(skill for skill, _ in development.get(career, [])) or '-')}</td></tr>")
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>Career report {esc(student_id)}</title>"
+        f"<link rel=\"stylesheet\" href=\"{ASSETS_DIR}/report.css\"></head><body>"
+        f"<h1>Career report &ndash; {esc(student_id)}</h1>"
+        "<h2>Recommended careers</h2><table><tr><th>#</th><th>Career</th><th>Key skills</th>"
+        "<th>Outlook</th><th>Demand</th><th>Salary range</th><th>Skills to develop</th></tr>"
+        f"{''.join(career_rows) or '<tr><td colspan=7>No careers recommended</td></tr>'}</table>"
+        "<h2>Scores</h2>" + (f"<img src=\"{esc(chart)}\" alt=\"Category scores\">" if chart else "") +
+        f"<table><tr><th>Category</th><th>Score</th></tr>{score_rows}</table>"
+        "</body></html>\n")
+
+
+def _write_reports(jobs, out_dir, pdf):
+    if pdf:
+        from weasyprint import HTML
+    written = []
+    for student_id, scores, careers, chart, development in jobs:
+        page = render_report(student_id, scores, careers, chart, development)
+        if pdf:
+            path = os.path.join(out_dir, f"{student_id}.pdf")
+            HTML(string=page, base_url=out_dir + os.sep).write_pdf(path)
+        else:
+            path = os.path.join(out_dir, f"{student_id}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(page)
+        written.append(path)
+    return written
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def build_reports(store_path=SESSIONS_PATH, out_dir=REPORTS_DIR, workers=None, pdf=False):
+    """Write one report per stored session plus an index.html; returns counts.
+
+    pdf=True needs WeasyPrint installed.
+    """
+    if pdf and importlib.util.find_spec("weasyprint") is None:
+        raise RuntimeError("PDF reports need WeasyPrint installed")
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(os.path.join(out_dir, ASSETS_DIR), exist_ok=True)
+    with open(os.path.join(out_dir, ASSETS_DIR, "report.css"), "w", encoding="utf-8") as f:
+        f.write(STYLESHEET)
+
+    engine = SkillGapEngine(ONET_SKILLS_PATH)
+    RECOMMENDATION_CACHE.load()
+    students, chart_jobs, all_careers = [], [], set()
+    for i, (record, _) in enumerate(iter_sessions(store_path)):
+        student_id = f"student_{i + 1:05d}"
+        scores, careers = session_scores(record), session_careers(record)
+        all_careers.update(careers[:MAX_CAREERS])
+        chart = f"{ASSETS_DIR}/scores_{student_id}.png" if scores else None
+        if chart:
+            chart_jobs.append((scores, os.path.join(out_dir, chart)))
+        # Same namespace and key as the CLI: gaps to every known career for this profile
+        development = RECOMMENDATION_CACHE.get_or_compute(
+            "development_areas", scores, lambda: engine.development_areas(scores, engine.careers), engine.version)
+        development = {c: development[c] for c in careers[:MAX_CAREERS] if c in development}
+        students.append((student_id, scores, careers, chart, development))
+    RECOMMENDATION_CACHE.save()
+
+    context = {"onet": load_taxonomy().onet_data, "market": get_market_store().lookup_many(sorted(all_careers))}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(context,)) as pool:
+        chart_futures = [pool.submit(_render_charts, chunk) for chunk in _chunks(chart_jobs, CHARTS_PER_TASK)]
+        if pdf:  # PDFs embed the chart files, so they must exist first
+            for future in chart_futures:
+                future.result()
+        report_futures = [pool.submit(_write_reports, chunk, out_dir, pdf)
+                          for chunk in _chunks(students, REPORTS_PER_TASK)]
+        reports = [path for future in report_futures for path in future.result()]
+        for future in chart_futures:
+            future.result()
+
+    links = "".join(f"<li><a href=\"{html.escape(os.path.basename(p))}\">{html.escape(s[0])}</a></li>"
+                    for p, s in zip(reports, students))
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Career reports</title>"
+                f"<link rel=\"stylesheet\" href=\"{ASSETS_DIR}/report.css\"></head>"
+                f"<body><h1>Career reports</h1><ul>{links}</ul></body></html>\n")
+    return {"reports": len(reports), "charts": len(chart_jobs)}
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [a for a in sys.argv[1:] if a != "--pdf"]
+    counts = build_reports(out_dir=args[0] if args else REPORTS_DIR, pdf="--pdf" in sys.argv)
+    print(f"Wrote {counts['reports']} reports ({counts['charts']} charts) to {args[0] if args else REPORTS_DIR}/")
+    print(RECOMMENDATION_CACHE.summary())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Circuit breakers and per-session deadline budgets for external calls.
+
+Each dependency (the language model, O*NET) gets a breaker that opens after
+repeated failures; while it is open calls go straight to the local fallback
+instead of waiting for another network error, and after a cool-down one
+trial call is let through. A session deadline caps the total time a
+session may spend waiting on external services. A FallbackTracker counts
+the calls that fell back inside a block, so degraded results can be kept
+out of caches.
+"""
+
+import contextvars
+import threading
+import time
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a timed half-open trial."""
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; moves an expired open breaker to half-open."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                return True
+            if self.state == CLOSED:
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class SessionDeadline:
+    """Total time budget for external calls during one session."""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+BREAKERS = {}
+_breakers_lock = threading.Lock()
+_current_deadline = contextvars.ContextVar("session_deadline", default=None)
+_current_tracker = contextvars.ContextVar("fallback_tracker", default=None)
+
+
+class FallbackTracker:
+    """Counts guarded calls in the current context that returned their fallback while the block runs."""
+
+    def __init__(self):
+        self.count = 0
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_tracker.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _current_tracker.reset(self._token)
+
+    @property
+    def degraded(self) -> bool:
+        return self.count > 0
+
+
+def get_breaker(name, **kwargs) -> CircuitBreaker:
+    """Process-wide breaker for a dependency, created on first use."""
+    with _breakers_lock:
+        if name not in BREAKERS:
+            BREAKERS[name] = CircuitBreaker(name, **kwargs)
+        return BREAKERS[name]
+
+
+def start_session_deadline(seconds) -> SessionDeadline:
+    """Set the external-call budget for the current session (thread/context)."""
+    deadline = SessionDeadline(seconds)
+    _current_deadline.set(deadline)
+    return deadline
+
+
+def call_timeout(default: float) -> float:
+    """Timeout for the next external call: the default, capped by the session budget."""
+    deadline = _current_deadline.get()
+    return default if deadline is None else min(default, deadline.remaining())
+
+
+def guarded_call(dependency, fn, fallback, *args, **kwargs):
+    """Call fn through the dependency's breaker; return fallback() when open, over budget or failing.
+
+    A None result from fn also counts as a failure, matching how the API helpers signal errors.
+    """
+    breaker = get_breaker(dependency)
+    deadline = _current_deadline.get()
+
+    def fell_back():
+        tracker = _current_tracker.get()
+        if tracker is not None:
+            tracker.count += 1
+        return fallback()
+
+    if (deadline is not None and deadline.expired()) or not breaker.allow():
+        return fell_back()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        return fell_back()
+    if result is None:
+        breaker.record_failure()
+        return fell_back()
+    breaker.record_success()
+    return result
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Validated parsing of Likert answers.
+
+Each response scale gets one precomputed lookup table that accepts the
+numeric value ("1".."5"), the label in any case and spacing ("strongly
+agree"), unambiguous prefixes ("strongly a", "some") and label initials ("sa").
+The interactive prompt and bulk CSV import share the same table, so every
+answer costs one dict lookup.
+"""
+
+import csv
+import functools
+import re
+
+import numpy as np
+
+INVALID = 0  # code for an unparseable answer in bulk arrays
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+
+def normalize(text) -> str:
+    """Lower-case, trim and collapse spaces, underscores and hyphens to single spaces."""
+    return _SEPARATORS.sub(" ", str(text).strip().lower())
+
+
+class ResponseParser:
+    """Answer text -> scale value for one response scale."""
+
+    def __init__(self, scale: dict):
+        self.scale = dict(scale)
+        table = {}
+        ambiguous = set()
+
+        def add(key, value):
+            if key in table and table[key] != value:
+                ambiguous.add(key)
+            table[key] = value
+
+        for label, value in self.scale.items():
+            full = normalize(label)
+            for end in range(1, len(full) + 1):
+                if full[end - 1] != " ":
+                    add(full[:end], value)
+            words = full.split()
+            if len(words) > 1:
+                add("".join(w[0] for w in words), value)
+        for key in ambiguous:
+            del table[key]
+        # Exact labels and numbers always win over prefixes of other labels
+        for label, value in self.scale.items():
+            table[normalize(label)] = value
+            table[str(value)] = value
+        self.table = table
+        # Raw spellings resolve without normalising, which covers nearly all bulk input
+        self._raw = dict(table)
+        for label, value in self.scale.items():
+            self._raw[label] = value
+            self._raw[label.upper()] = value
+
+    def parse(self, text):
+        """Scale value for an answer, or None if it is not recognised."""
+        value = self._raw.get(text)
+        if value is None and text is not None:
+            value = self.table.get(normalize(text))
+        return value
+
+    def parse_many(self, answers) -> np.ndarray:
+        """int8 codes for a sequence of answers; INVALID where an answer is not recognised."""
+        raw, table = self._raw, self.table
+        return np.fromiter(
+            (raw.get(a) or table.get(normalize(a), INVALID) for a in answers),
+            dtype=np.int8)
+
+    def choices(self) -> str:
+        low, high = min(self.scale.values()), max(self.scale.values())
+        return f"{low}-{high} or {', '.join(self.scale)}"
+
+
+@functools.lru_cache(maxsize=None)
+def _parser(items):
+    return ResponseParser(dict(items))
+
+
+def get_parser(scale: dict) -> ResponseParser:
+    """Shared parser for a scale, built once per distinct scale."""
+    return _parser(tuple(scale.items()))
+
+
+def read_likert(scale: dict, input_fn=input) -> int:
+    """Prompt until the answer parses and return its scale value."""
+    parser = get_parser(scale)
+    value = parser.parse(input_fn(f"Enter response ({parser.choices()}): "))
+    while value is None:
+        value = parser.parse(input_fn(f"Invalid response. Enter ({parser.choices()}): "))
+    return value
+
+
+def load_csv(path, scale: dict, columns=None, chunk_rows=100000):
+    """(columns, int8 matrix) of coded answers from a CSV with one row per respondent.
+
+    columns selects the answer columns (default: all); unrecognised or empty
+    cells are INVALID. Rows are parsed in chunks so only the int8 result is
+    held in memory.
+    """
+    parser = get_parser(scale)
+    chunks = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = list(columns or header)
+        index = [header.index(c) for c in columns]
+        rows = []
+        for row in reader:
+            rows.extend(row[i] if i < len(row) else "" for i in index)
+            if len(rows) >= chunk_rows * len(index):
+                chunks.append(parser.parse_many(rows))
+                rows = []
+        chunks.append(parser.parse_many(rows))
+    codes = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int8)
+    return columns, codes.reshape(-1, len(columns))
+
+
+if __name__ == "__main__":
+    import sys
+
+    from taxonomy import load_taxonomy
+
+    if len(sys.argv) < 2:
+        sys.exit("usage: python response_parser.py answers.csv [frequency|agreement]")
+    scale_name = sys.argv[2] if len(sys.argv) > 2 else "agreement"
+    names, matrix = load_csv(sys.argv[1], load_taxonomy().response_scales[scale_name])
+    invalid = int((matrix == INVALID).sum())
+    print(f"Parsed {matrix.shape[0]} rows x {len(names)} columns; {invalid} unrecognised answers")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Careless-response screening for Likert sessions.
+
+Works on the respondents x items answer matrix (NaN where an item was not
+asked) and computes, for every row at once: the longest run of identical
+answers (longstring), intra-individual response variability (IRV), the gap
+between a category's normal and reverse-keyed items, and the median time
+per answer when timings are known. Each indicator past its cut-off is a
+flag, and every flag halves the session's weight, so suspect sessions can
+be dropped or down-weighted before norms and model training use them.
+
+Run `python response_quality.py answers.npy` on a synthetic_cohort NPY file.
+"""
+
+import numpy as np
+
+LONGSTRING_MIN = 8          # a run this long ...
+LONGSTRING_SHARE = 0.6      # ... covering this share of the answered items
+IRV_MIN = 0.3               # standard deviation of a row's answers
+MIN_ITEMS = 8               # fewer answers than this are never flagged on pattern alone
+INCONSISTENCY_MAX = 2.0     # |normal mean - keyed reverse mean| within a category
+MIN_SECONDS_PER_ITEM = 1.0  # median answer time
+FLAGS = ["longstring", "low_variance", "reverse_inconsistent", "too_fast"]
+MIN_QUALITY_WEIGHT = 0.5    # sessions weighted below this are left out of training
+
+
+def longstring(matrix):
+    """Longest run of identical consecutive answers per row, skipping unanswered items."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.shape[1] == 0:
+        return np.zeros(len(matrix), dtype=np.int64)
+    # Move each row's answers to the front, in order, so gaps do not break runs
+    order = np.argsort(np.isnan(matrix), axis=1, kind="stable")
+    values = np.take_along_axis(matrix, order, axis=1)
+    answered = (~np.isnan(values)).sum(axis=1)
+    if values.shape[1] < 2:
+        return np.minimum(answered, 1)
+    same = values[:, 1:] == values[:, :-1]
+    steps = np.arange(same.shape[1])
+    last_break = np.maximum.accumulate(np.where(same, -1, steps), axis=1)
+    runs = np.where(same, steps - last_break, 0)
+    return np.where(answered > 0, runs.max(axis=1) + 1, 0)
+
+
+def response_variability(matrix):
+    """Standard deviation of each row's answers (NaN with fewer than two answers)."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    answered = (~np.isnan(matrix)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(matrix, axis=1) / answered
+        var = np.nansum((matrix - mean[:, None]) ** 2, axis=1) / answered
+    return np.where(answered >= 2, np.sqrt(var), np.nan)
+
+
+def reverse_inconsistency(matrix, layout):
+    """Largest |normal - keyed reverse| category mean gap per row; NaN where no category has both."""
+    keyed = layout.keyed(matrix)
+    answered = ~np.isnan(keyed)
+    values = np.where(answered, keyed, 0.0)
+
+    def means(mask):
+        membership = layout.membership * mask[:, None]
+        counts = answered.astype(np.float64) @ membership
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, (values @ membership) / counts, np.nan)
+
+    gap = np.abs(means(~layout.reverse) - means(layout.reverse))
+    has_gap = ~np.isnan(gap).all(axis=1)
+    return np.where(has_gap, np.nanmax(np.where(np.isnan(gap), -np.inf, gap), axis=1), np.nan)
+
+
+def screen(matrix, layout, timings=None) -> dict:
+    """Quality indicators, flags (rows x FLAGS) and weights for an answer matrix.
+
+    timings, if given, is a matching matrix of seconds per answer (NaN if unknown).
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    answered = (~np.isnan(matrix)).sum(axis=1)
+    runs = longstring(matrix)
+    irv = response_variability(matrix)
+    inconsistency = reverse_inconsistency(matrix, layout)
+    if timings is None:
+        seconds = np.full(len(matrix), np.nan)
+    else:
+        timings = np.asarray(timings, dtype=np.float64)
+        known = ~np.isnan(timings)
+        seconds = np.full(len(matrix), np.nan)
+        rows = known.any(axis=1)
+        seconds[rows] = np.nanmedian(timings[rows], axis=1)
+    enough = answered >= MIN_ITEMS
+    flags = np.column_stack([
+        enough & (runs >= LONGSTRING_MIN) & (runs >= LONGSTRING_SHARE * answered),
+        enough & (np.nan_to_num(irv, nan=np.inf) < IRV_MIN),
+        np.nan_to_num(inconsistency, nan=0.0) >= INCONSISTENCY_MAX,
+        np.nan_to_num(seconds, nan=np.inf) < MIN_SECONDS_PER_ITEM,
+    ])
+    return {"longstring": runs, "irv": irv, "inconsistency": inconsistency, "median_seconds": seconds,
+            "flags": flags, "weight": 0.5 ** flags.sum(axis=1)}
+
+
+def describe(report, row=0) -> list:
+    """Names of the flags raised for one row."""
+    return [name for name, raised in zip(FLAGS, report["flags"][row]) if raised]
+
+
+def screen_session(responses: dict, questions: dict, layout, timings=None):
+    """(weight, flag names) for one student's {category: [answers]} to the asked questions.
+
+    timings maps question text to seconds taken; unknown questions are ignored.
+    """
+    matrix = layout.to_matrix([(responses, questions)])
+    seconds = None
+    if timings:
+        seconds = np.full(matrix.shape, np.nan)
+        for question, elapsed in timings.items():
+            if question in layout.index:
+                seconds[0, layout.index[question]] = elapsed
+    report = screen(matrix, layout, seconds)
+    return float(report["weight"][0]), describe(report)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from session_model import get_schema
+
+    if len(sys.argv) < 2:
+        sys.exit("usage: python response_quality.py answers.npy")
+    answers = np.load(sys.argv[1], mmap_mode="r")
+    layout = get_schema().layout
+    flagged = np.zeros(len(FLAGS), dtype=np.int64)
+    suspect = 0
+    for start in range(0, len(answers), 100000):
+        chunk = np.asarray(answers[start:start + 100000], dtype=np.float64)
+        chunk[chunk == 0] = np.nan
+        report = screen(chunk, layout)
+        flagged += report["flags"].sum(axis=0)
+        suspect += int((report["weight"] < MIN_QUALITY_WEIGHT + 1e-9).sum())
+    print(f"{len(answers)} sessions, {suspect} weighted at or below {MIN_QUALITY_WEIGHT}")
+    for name, count in zip(FLAGS, flagged):
+        print(f"  {name}: {count}")
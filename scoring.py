@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Keyed scoring engine for the Likert layers.
+
+Reverse-keyed items are flipped before averaging and the bipolar MBTI items
+are turned into type letters instead of being averaged into one number.
+The same item layout scores a single student or a whole cohort matrix.
+"""
+
+import numpy as np
+
+from taxonomy import load_taxonomy
+
+MBTI_AXES = [("I", "E"), ("S", "N"), ("T", "F"), ("J", "P")]
+
+
+class ItemLayout:
+    """Flat column layout for a set of Likert question dicts.
+
+    Item keying lives with the questions in taxonomy/questions.json:
+    reverse-keyed items measure *less* of their category when agreed with, and
+    bipolar MBTI items pick the first pole on low answers, the second on high
+    ones. It is read from the given taxonomy, else the current compiled one.
+    """
+
+    def __init__(self, question_sets, scale, taxonomy=None):
+        taxonomy = taxonomy or load_taxonomy()
+        reverse_keyed, mbti_items = taxonomy.reverse_keyed_items, taxonomy.mbti_items
+        self.items = []
+        self.categories = []
+        item_category = []
+        for questions in question_sets:
+            for category, qs in questions.items():
+                if category not in self.categories:
+                    self.categories.append(category)
+                for q in qs:
+                    self.items.append(q)
+                    item_category.append(self.categories.index(category))
+        self.index = {q: i for i, q in enumerate(self.items)}
+        self.low, self.high = min(scale.values()), max(scale.values())
+        self.midpoint = (self.low + self.high) / 2
+
+        n_items = len(self.items)
+        self.item_category = np.array(item_category, dtype=np.intp)
+        self.reverse = np.array([q in reverse_keyed for q in self.items])
+        # MBTI items do not contribute to their category mean
+        self.mbti_axis = np.full(n_items, -1, dtype=np.intp)
+        for i, q in enumerate(self.items):
+            if q in mbti_items:
+                self.mbti_axis[i] = MBTI_AXES.index(mbti_items[q])
+        self.membership = np.zeros((n_items, len(self.categories)), dtype=np.float64)
+        likert = self.mbti_axis < 0
+        self.membership[np.flatnonzero(likert), self.item_category[likert]] = 1.0
+        self.axis_membership = np.zeros((n_items, len(MBTI_AXES)), dtype=np.float64)
+        bipolar = np.flatnonzero(~likert)
+        self.axis_membership[bipolar, self.mbti_axis[bipolar]] = 1.0
+
+    def to_matrix(self, responses_list):
+        """Stack per-student {category: [values]} dicts into an (n, items) array.
+
+        Each entry is a (responses, questions) pair so randomized question
+        subsets line up with the right columns; unanswered items are NaN.
+        """
+        matrix = np.full((len(responses_list), len(self.items)), np.nan)
+        for row, (responses, questions) in enumerate(responses_list):
+            for category, vals in responses.items():
+                for q, v in zip(questions.get(category, []), vals):
+                    if q in self.index and isinstance(v, (int, float)):
+                        matrix[row, self.index[q]] = v
+        return matrix
+
+    def keyed(self, matrix):
+        """Flip reverse-keyed columns around the scale midpoint."""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        return np.where(self.reverse, self.low + self.high - matrix, matrix)
+
+    def category_means(self, matrix):
+        """Keyed category means for every row; NaN where nothing was answered."""
+        keyed = self.keyed(matrix)
+        answered = ~np.isnan(keyed)
+        sums = np.where(answered, keyed, 0.0) @ self.membership
+        counts = answered.astype(np.float64) @ self.membership
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    def mbti(self, matrix):
+        """MBTI type strings and preference clarity (0-1) for every row.
+
+        Axes with no answer get an 'X'; a neutral answer falls to the first pole.
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        answered = ~np.isnan(matrix)
+        sums = np.where(answered, matrix, 0.0) @ self.axis_membership
+        counts = answered.astype(np.float64) @ self.axis_membership
+        with np.errstate(invalid="ignore", divide="ignore"):
+            axis_means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        first = np.array([a for a, _ in MBTI_AXES])
+        second = np.array([b for _, b in MBTI_AXES])
+        letters = np.where(axis_means > self.midpoint, second, first)
+        letters = np.where(np.isnan(axis_means), "X", letters)
+        types = np.array(["".join(row) for row in letters], dtype=str)
+        distance = np.abs(axis_means - self.midpoint) / ((self.high - self.low) / 2)
+        answered_axes = (~np.isnan(distance)).sum(axis=1)
+        clarity = np.nansum(distance, axis=1) / np.maximum(answered_axes, 1)
+        return types, clarity
+
+    def score_matrix(self, matrix):
+        """Score a whole cohort in one pass: (category means, MBTI types, clarity)."""
+        types, clarity = self.mbti(matrix)
+        return self.category_means(matrix), types, clarity
+
+
+def score_likert_layer(responses, questions, scale, taxonomy=None):
+    """Keyed scores for one student's layer, ready to merge into all_scores.
+
+    Adds the MBTI type under "MBTI" and an "MBTI_<TYPE>" score on the Likert
+    range, so complete types can match keys such as MBTI_INFP in CAREER_MAPPING.
+    """
+    layout = ItemLayout([questions], scale, taxonomy)
+    means, types, clarity = layout.score_matrix(layout.to_matrix([(responses, questions)]))
+    scores = {}
+    for j, category in enumerate(layout.categories):
+        if not np.isnan(means[0, j]):
+            scores[category] = float(means[0, j])
+    if layout.axis_membership.any():
+        mbti_type = str(types[0])
+        scores["MBTI"] = mbti_type
+        if "X" not in mbti_type:
+            scores[f"MBTI_{mbti_type}"] = float(layout.midpoint + clarity[0] * (layout.high - layout.midpoint))
+    return scores
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory representation of a live session.
+
+The scripts keep all_responses (layer -> category -> list of ints) and
+all_scores (a dict mixing floats and strings), hundreds of Python objects
+per student. A Session instead holds one signed-byte array of answers
+indexed by question ID, a float32 score array indexed by category and a
+uint16 array of career IDs; question, category and career names live once
+in a SessionSchema shared by every session. to_bytes() packs a session into
+a few hundred bytes.
+
+Run `python session_model.py` to measure the per-session footprint.
+"""
+
+import functools
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+import numpy as np
+
+from scoring import ItemLayout
+from taxonomy import load_taxonomy
+
+UNANSWERED = 0
+_HEADER = struct.Struct("<BIHHHI")  # format version, schema id, items, categories, careers, text bytes
+FORMAT_VERSION = 1
+
+
+class SessionSchema:
+    """Question, category and career IDs shared by all sessions of one taxonomy."""
+
+    __slots__ = ("layout", "careers", "career_index", "schema_id")
+
+    def __init__(self, taxonomy=None, scale_name="agreement"):
+        taxonomy = taxonomy or load_taxonomy()
+        likert_layers = [qs for layer, qs in taxonomy.layers.items() if layer not in taxonomy.open_ended_layers]
+        self.layout = ItemLayout(likert_layers, taxonomy.response_scales[scale_name], taxonomy)
+        self.careers = sorted({c for cs in taxonomy.career_mapping.values() for c in cs} | set(taxonomy.onet_data))
+        self.career_index = {c: i for i, c in enumerate(self.careers)}
+        names = "\n".join(self.layout.items + self.layout.categories + self.careers)
+        self.schema_id = zlib.crc32(names.encode("utf-8"))
+
+
+@functools.lru_cache(maxsize=1)
+def get_schema() -> SessionSchema:
+    """Schema for the current compiled taxonomy."""
+    return SessionSchema()
+
+
+class Session:
+    """Answers, scores and careers of one student in flat typed arrays."""
+
+    __slots__ = ("schema", "answers", "scores", "career_ids", "texts")
+
+    def __init__(self, schema=None):
+        self.schema = schema or get_schema()
+        self.answers = array("b", bytes(len(self.schema.layout.items)))
+        self.scores = array("f", [float("nan")]) * len(self.schema.layout.categories)
+        self.career_ids = array("H")
+        self.texts = None  # open-ended answers, only allocated when there are any
+
+    def record(self, question: str, value):
+        """Store one answer: Likert values by question ID, anything else as text."""
+        i = self.schema.layout.index.get(question)
+        if i is not None and isinstance(value, int):
+            self.answers[i] = value
+        else:
+            if self.texts is None:
+                self.texts = {}
+            self.texts[question] = str(value)
+
+    def record_layer(self, responses: dict, questions: dict):
+        """Store a collect_responses() result for the questions that were asked."""
+        for category, values in responses.items():
+            for question, value in zip(questions.get(category, []), values):
+                self.record(question, value)
+
+    def answer_matrix(self):
+        """(1, items) float array of answers, NaN where unanswered."""
+        answers = np.frombuffer(self.answers, dtype=np.int8).astype(np.float64)
+        answers[answers == UNANSWERED] = np.nan
+        return answers[None, :]
+
+    def score(self):
+        """Recompute the keyed category means from the stored answers."""
+        means = self.schema.layout.category_means(self.answer_matrix())[0]
+        self.scores = array("f", means.astype(np.float32).tobytes())
+
+    def mbti(self) -> str:
+        types, _ = self.schema.layout.mbti(self.answer_matrix())
+        return str(types[0])
+
+    def score_dict(self) -> dict:
+        """Scores in the scripts' all_scores form (answered categories only)."""
+        return {c: float(v) for c, v in zip(self.schema.layout.categories, self.scores) if v == v}
+
+    @property
+    def careers(self) -> list:
+        return [self.schema.careers[i] for i in self.career_ids]
+
+    @careers.setter
+    def careers(self, names):
+        try:
+            self.career_ids = array("H", [self.schema.career_index[c] for c in names])
+        except KeyError as e:
+            raise ValueError(f"Career not in the taxonomy: {e.args[0]}") from None
+
+    def to_bytes(self) -> bytes:
+        text = json.dumps(self.texts, separators=(",", ":")).encode("utf-8") if self.texts else b""
+        header = _HEADER.pack(FORMAT_VERSION, self.schema.schema_id, len(self.answers),
+                              len(self.scores), len(self.career_ids), len(text))
+        career_ids = array("H", self.career_ids)
+        if sys.byteorder != "little":
+            career_ids.byteswap()
+        scores = np.frombuffer(self.scores, dtype=np.float32).astype("<f4").tobytes()
+        return header + self.answers.tobytes() + scores + career_ids.tobytes() + text
+
+    @classmethod
+    def from_bytes(cls, data: bytes, schema=None):
+        schema = schema or get_schema()
+        version, schema_id, n_items, n_categories, n_careers, n_text = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION or schema_id != schema.schema_id:
+            raise ValueError("Session was serialized with a different format or taxonomy")
+        session = cls(schema)
+        pos = _HEADER.size
+        session.answers = array("b", data[pos:pos + n_items])
+        pos += n_items
+        session.scores = array("f", np.frombuffer(data, dtype="<f4", count=n_categories, offset=pos)
+                               .astype(np.float32).tobytes())
+        pos += 4 * n_categories
+        session.career_ids = array("H", data[pos:pos + 2 * n_careers])
+        if sys.byteorder != "little":
+            session.career_ids.byteswap()
+        pos += 2 * n_careers
+        if n_text:
+            session.texts = json.loads(data[pos:pos + n_text].decode("utf-8"))
+        return session
+
+
+def _random_session(schema, rng):
+    session = Session(schema)
+    session.answers = array("b", rng.integers(1, 6, len(schema.layout.items), dtype=np.int8).tobytes())
+    session.score()
+    session.career_ids = array("H", rng.choice(len(schema.careers), 8, replace=False).tolist())
+    return session
+
+
+def _random_dicts(schema, rng):
+    """The same session in the scripts' nested-dict form, for comparison."""
+    layout = schema.layout
+    responses = {}
+    for q, c in zip(layout.items, layout.item_category):
+        responses.setdefault(layout.categories[c], []).append(int(rng.integers(1, 6)))
+    scores = {c: sum(v) / len(v) for c, v in responses.items()}
+    careers = [schema.careers[i] for i in rng.choice(len(schema.careers), 8, replace=False)]
+    return {"responses": responses, "scores": scores, "careers": careers}
+
+
+def measure_footprint(n=2000, seed=0) -> dict:
+    """Measured bytes per live session for Session objects vs the nested-dict form."""
+    import tracemalloc
+
+    schema = get_schema()
+    rng = np.random.default_rng(seed)
+    result = {}
+    for name, build in (("session", _random_session), ("dicts", _random_dicts)):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        held = [build(schema, rng) for _ in range(n)]
+        result[name] = (tracemalloc.get_traced_memory()[0] - before) / n
+        tracemalloc.stop()
+        if name == "session":
+            result["serialized"] = float(np.mean([len(s.to_bytes()) for s in held]))
+        del held
+    return result
+
+
+if __name__ == "__main__":
+    sizes = measure_footprint()
+    print(f"Session object: {sizes['session']:.0f} bytes/session in memory, "
+          f"{sizes['serialized']:.0f} bytes serialized")
+    print(f"Nested dicts:   {sizes['dicts']:.0f} bytes/session in memory")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Append-only store for consented, anonymized career sessions.
+
+Each line of the JSONL file is what anonymize_data produces for a session:
+{"q1": {category: score}, "q2": [recommended careers]}, optionally with a
+"chosen" career once the student has picked one and a "quality_weight"
+below 1 when response_quality flagged the answers as careless.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from response_quality import MIN_QUALITY_WEIGHT
+
+SESSIONS_PATH = "career_sessions.jsonl"
+MISSING_SCORE = 0.0  # what the career model sees for a category a session did not answer
+
+
+def append_session(anonymized: dict, path: str = SESSIONS_PATH):
+    """Append one anonymized session record to the store."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(anonymized) + "\n")
+
+
+def iter_sessions(path: str = SESSIONS_PATH, offset: int = 0, end: int = None):
+    """Yield (record, end_offset) for every session stored after byte offset (and before end, if given)."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if end is not None and offset >= end:
+                break
+            offset += len(line)
+            line = line.strip()
+            if line:
+                yield json.loads(line), offset
+
+
+def session_scores(record: dict) -> dict:
+    """Numerical category scores of a stored session."""
+    scores = record.get("q1", {})
+    return {k: v for k, v in scores.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+
+
+def session_choice(record: dict):
+    """The career the student said they would pursue, or None if they did not pick one."""
+    return record.get("chosen") or None
+
+
+def session_careers(record: dict) -> list:
+    """Careers a stored session ended up in: the chosen one if known, else the recommendations."""
+    if record.get("chosen"):
+        return [record["chosen"]]
+    return list(record.get("q2", []))
+
+
+def session_weight(record: dict) -> float:
+    """Weight of a stored session from its response-quality screening; 1.0 if unscreened."""
+    weight = record.get("quality_weight", 1.0)
+    return float(weight) if isinstance(weight, (int, float)) and not isinstance(weight, bool) else 1.0
+
+
+def score_matrix(records, categories=None):
+    """Stack session scores into a float matrix (NaN where a category is missing).
+
+    Returns (categories, matrix); categories default to every one seen, sorted.
+    """
+    records = list(records)
+    score_dicts = [session_scores(r) for r in records]
+    if categories is None:
+        categories = sorted({c for s in score_dicts for c in s})
+    index = {c: j for j, c in enumerate(categories)}
+    matrix = np.full((len(score_dicts), len(categories)), np.nan)
+    for i, scores in enumerate(score_dicts):
+        for c, v in scores.items():
+            if c in index:
+                matrix[i, index[c]] = v
+    return list(categories), matrix
+
+
+def training_set(path: str = SESSIONS_PATH, label=session_choice):
+    """(categories, X, y, weights) the career model is trained and cross-validated on.
+
+    label maps a record to its career (None leaves the session out). Sessions
+    screened as careless (weight below MIN_QUALITY_WEIGHT) are left out, the
+    rest keep their quality weight; missing categories are MISSING_SCORE.
+    """
+    records = [r for r, _ in iter_sessions(path) if label(r) and session_weight(r) >= MIN_QUALITY_WEIGHT]
+    categories, X = score_matrix(records)
+    X = np.where(np.isnan(X), MISSING_SCORE, X)
+    y = np.array([label(r) for r in records], dtype=object)
+    weights = np.array([session_weight(r) for r in records])
+    return categories, X, y, weights
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+"Students like you chose..." nearest-neighbour search over stored sessions.
+
+Score vectors from the session store are centred on the scale midpoint,
+L2-normalised and written as a float32 .npy that queries open memory-mapped,
+so cosine similarity is a batched dot product over fixed-size chunks.
+The careers students chose are kept as CSR arrays next to the vectors;
+sessions without a choice still count as neighbours but name no career,
+and sessions screened as careless are left out.
+"""
+
+import json
+import os
+from collections import Counter
+
+import numpy as np
+
+from response_quality import MIN_QUALITY_WEIGHT
+from session_model import get_schema
+from session_store import SESSIONS_PATH, iter_sessions, session_choice, session_scores, session_weight
+
+INDEX_DIR = "similar_students_index"
+CHUNK_ROWS = 65536
+
+
+def _normalise(vectors, midpoint):
+    vectors = np.nan_to_num(np.asarray(vectors, dtype=np.float32) - np.float32(midpoint))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def build_index(store_path=SESSIONS_PATH, index_dir=INDEX_DIR, categories=None, midpoint=3.0):
+    """Stream the session store into an on-disk index in one pass and return the row count.
+
+    Only sessions already stored when the build starts are read, so sessions
+    appended meanwhile cannot leave the vectors and career arrays out of step.
+    """
+    categories = list(categories or get_schema().layout.categories)
+    end = os.path.getsize(store_path) if os.path.exists(store_path) else 0
+    os.makedirs(index_dir, exist_ok=True)
+    raw_path = os.path.join(index_dir, "vectors.raw")
+    index = {c: j for j, c in enumerate(categories)}
+    career_ids, indptr, indices = {}, [0], []
+    chunk = np.full((CHUNK_ROWS, len(categories)), np.nan, dtype=np.float32)
+    n_rows = row = 0
+    # Rows are unknown until the store has been read, so normalised chunks go to
+    # a raw file first and are copied into the .npy once its shape is known
+    with open(raw_path, "wb") as raw:
+        for record, _ in iter_sessions(store_path, end=end):
+            if session_weight(record) < MIN_QUALITY_WEIGHT:
+                continue
+            for c, v in session_scores(record).items():
+                if c in index:
+                    chunk[row, index[c]] = v
+            chosen = session_choice(record)
+            if chosen:
+                indices.append(career_ids.setdefault(chosen, len(career_ids)))
+            indptr.append(len(indices))
+            row += 1
+            if row == CHUNK_ROWS:
+                raw.write(_normalise(chunk, midpoint).tobytes())
+                chunk.fill(np.nan)
+                n_rows, row = n_rows + row, 0
+        if row:
+            raw.write(_normalise(chunk[:row], midpoint).tobytes())
+            n_rows += row
+    # Every file is written beside the live one and swapped in, so open
+    # memory maps keep their old file and readers never see a partial one
+    staging = f".tmp{os.getpid()}"
+    vectors_path = os.path.join(index_dir, "vectors.npy")
+    vectors = np.lib.format.open_memmap(vectors_path + staging, mode="w+",
+                                        dtype=np.float32, shape=(n_rows, len(categories)))
+    row_bytes = 4 * len(categories)
+    with open(raw_path, "rb") as raw:
+        for start in range(0, n_rows, CHUNK_ROWS):
+            rows = min(CHUNK_ROWS, n_rows - start)
+            vectors[start:start + rows] = np.frombuffer(raw.read(rows * row_bytes), dtype=np.float32) \
+                .reshape(rows, len(categories))
+    vectors.flush()
+    del vectors
+    os.remove(raw_path)
+    os.replace(vectors_path + staging, vectors_path)
+    for name, array in (("career_indptr.npy", np.array(indptr, dtype=np.int64)),
+                        ("career_indices.npy", np.array(indices, dtype=np.int32))):
+        path = os.path.join(index_dir, name)
+        with open(path + staging, "wb") as f:
+            np.save(f, array)
+        os.replace(path + staging, path)
+    meta_path = os.path.join(index_dir, "meta.json")
+    with open(meta_path + staging, "w") as f:
+        json.dump({"categories": categories, "careers": list(career_ids), "midpoint": midpoint,
+                   "store_offset": end}, f)
+    os.replace(meta_path + staging, meta_path)
+    return n_rows
+
+
+class SimilarStudents:
+    """Memory-mapped exact k-NN over normalised score vectors."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            meta = json.load(f)
+        self.categories = meta["categories"]
+        self.careers = meta["careers"]
+        self.midpoint = meta["midpoint"]
+        self.vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode="r")
+        self.indptr = np.load(os.path.join(index_dir, "career_indptr.npy"))
+        self.indices = np.load(os.path.join(index_dir, "career_indices.npy"))
+
+    def query_vectors(self, scores_list):
+        """Turn score dicts into normalised query rows in index column order."""
+        queries = np.full((len(scores_list), len(self.categories)), np.nan, dtype=np.float32)
+        for i, scores in enumerate(scores_list):
+            for j, c in enumerate(self.categories):
+                v = scores.get(c)
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    queries[i, j] = v
+        return _normalise(queries, self.midpoint)
+
+    def search(self, scores_list, k=20):
+        """Top-k (similarities, row ids) per query, scanning the index in chunks."""
+        queries = self.query_vectors(scores_list)
+        n = len(self.vectors)
+        k = min(k, n)
+        if k == 0:
+            return np.zeros((len(queries), 0), dtype=np.float32), np.zeros((len(queries), 0), dtype=np.int64)
+        best_sim = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        best_ids = np.zeros((len(queries), k), dtype=np.int64)
+        for start in range(0, n, CHUNK_ROWS):
+            chunk_sims = queries @ self.vectors[start:start + CHUNK_ROWS].T
+            chunk_ids = np.broadcast_to(np.arange(start, start + chunk_sims.shape[1]), chunk_sims.shape)
+            sims = np.concatenate([best_sim, chunk_sims], axis=1)
+            ids = np.concatenate([best_ids, chunk_ids], axis=1)
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            best_sim = np.take_along_axis(sims, top, axis=1)
+            best_ids = np.take_along_axis(ids, top, axis=1)
+        order = np.argsort(-best_sim, axis=1)
+        return np.take_along_axis(best_sim, order, axis=1), np.take_along_axis(best_ids, order, axis=1)
+
+    def neighbour_careers(self, scores, k=20, top=5):
+        """Careers the k most similar students chose, weighted by similarity; [] if none of them chose."""
+        sims, ids = self.search([scores], k)
+        tally = Counter()
+        for sim, row in zip(sims[0], ids[0]):
+            if sim <= 0:
+                continue
+            for career_id in self.indices[self.indptr[row]:self.indptr[row + 1]]:
+                tally[self.careers[career_id]] += float(sim)
+        return [career for career, _ in tally.most_common(top)]
+
+
+if __name__ == "__main__":
+    rows = build_index()
+    print(f"Indexed {rows} stored sessions into {INDEX_DIR}/")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Skill-gap analysis between Layer 3 aptitudes and occupation requirements.
+
+Aptitude scores are mapped onto O*NET skill dimensions through a weight
+matrix, occupation requirements are held as a dense careers x skills
+matrix, and gaps for every career (and every student in a cohort) come
+from one broadcast subtraction. Requirements are read from the O*NET
+Skills file when it is available (level and importance per skill). Careers
+it does not cover are derived from the taxonomy: every category a career is
+mapped from implies a few skills at a moderate level, and skills listed in
+the taxonomy's O*NET data (only a handful of careers have any) raise those
+to the full requirement. A career whose categories imply no skill is left
+out, and callers show no development areas for it.
+
+The skill dimensions, aptitude -> skill weights, category -> skill lists and
+O*NET skill-name aliases live in taxonomy/careers.json and are checked by
+taxonomy.validate() with the rest of the career data.
+"""
+
+import csv
+import hashlib
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+
+from taxonomy import load_taxonomy
+
+load_dotenv()
+ONET_SKILLS_PATH = os.getenv("ONET_SKILLS_PATH", os.path.join("data", "onet_skills.txt"))
+
+LOW, HIGH = 1.0, 5.0
+REQUIRED_LEVEL, BASELINE_LEVEL = 4.0, 2.0      # listed vs unlisted skills in the fallback data
+CATEGORY_LEVEL = 3.5                            # skills implied by a career's categories
+REQUIRED_IMPORTANCE, BASELINE_IMPORTANCE = 1.0, 0.25
+CATEGORY_IMPORTANCE = 0.75
+ONET_MAX_LEVEL = 7.0
+
+
+def _onet_requirements(path, soc_codes, skills):
+    """{career: {skill: (level 1-5, importance 1-5)}} from an O*NET Skills.txt file."""
+    by_code = {}
+    for career, code in soc_codes.items():
+        by_code.setdefault(code, []).append(career)
+    found = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f, delimiter="\t"):
+            skill = row.get("Element Name")
+            careers = by_code.get(row.get("O*NET-SOC Code", ""))
+            if skill not in skills or not careers:
+                continue
+            try:
+                value = float(row["Data Value"])
+            except (KeyError, ValueError):
+                continue
+            for career in careers:
+                level, importance = found.setdefault(career, {}).get(skill, (BASELINE_LEVEL, BASELINE_IMPORTANCE))
+                if row.get("Scale ID") == "LV":
+                    level = LOW + (HIGH - LOW) * value / ONET_MAX_LEVEL
+                elif row.get("Scale ID") == "IM":
+                    importance = value
+                found[career][skill] = (level, importance)
+    return found
+
+
+def _taxonomy_requirements(taxonomy):
+    """{career: {skill: (level, importance)}} implied by mapped categories, raised by listed O*NET skills."""
+    found = {}
+    for category, careers in taxonomy.career_mapping.items():
+        for career in careers:
+            for skill in taxonomy.category_skills.get(category, []):
+                found.setdefault(career, {})[skill] = (CATEGORY_LEVEL, CATEGORY_IMPORTANCE)
+    for career, info in taxonomy.onet_data.items():
+        for skill in {taxonomy.skill_aliases[s] for s in info.get("skills", []) if s in taxonomy.skill_aliases}:
+            found.setdefault(career, {})[skill] = (REQUIRED_LEVEL, REQUIRED_IMPORTANCE)
+    return found
+
+
+class SkillGapEngine:
+    """Aptitude -> skill mapping and careers x skills requirement matrices."""
+
+    def __init__(self, onet_skills_path=None, taxonomy=None):
+        taxonomy = taxonomy or load_taxonomy()
+        requirements = _taxonomy_requirements(taxonomy)
+        if onet_skills_path and os.path.exists(onet_skills_path):
+            requirements.update(_onet_requirements(onet_skills_path, taxonomy.soc_codes, set(taxonomy.skills)))
+        self.aptitudes = list(taxonomy.aptitude_skills)
+        self.skills = list(taxonomy.skills)
+        self.careers = sorted(requirements)
+        self.career_index = {c: i for i, c in enumerate(self.careers)}
+        self.aptitude_weights = np.array([[taxonomy.aptitude_skills[a].get(s, 0.0) for s in self.skills]
+                                          for a in self.aptitudes]).reshape(len(self.aptitudes), len(self.skills))
+        self.required = np.full((len(self.careers), len(self.skills)), BASELINE_LEVEL)
+        self.importance = np.full((len(self.careers), len(self.skills)), BASELINE_IMPORTANCE)
+        for i, career in enumerate(self.careers):
+            for skill, (level, importance) in requirements[career].items():
+                j = self.skills.index(skill)
+                self.required[i, j], self.importance[i, j] = level, importance
+        digest = hashlib.sha1("\n".join(self.careers).encode())
+        digest.update(self.required.tobytes() + self.importance.tobytes())
+        self.version = digest.hexdigest()[:16]  # keys cached development areas
+
+    def skill_levels(self, aptitude_scores):
+        """(students, skills) levels from an (students, aptitudes) score array; NaN if no evidence."""
+        scores = np.atleast_2d(np.asarray(aptitude_scores, dtype=np.float64))
+        answered = ~np.isnan(scores)
+        total = np.where(answered, scores, 0.0) @ self.aptitude_weights
+        weight = answered.astype(np.float64) @ self.aptitude_weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(weight > 0, total / weight, np.nan)
+
+    def gaps(self, levels):
+        """(students, careers, skills) shortfall below each requirement; 0 where met or unknown."""
+        shortfall = self.required[None, :, :] - np.atleast_2d(levels)[:, None, :]
+        return np.where(np.isnan(shortfall), 0.0, np.maximum(shortfall, 0.0))
+
+    def fit(self, levels):
+        """(students, careers) fit in [0, 1]: 1 - importance-weighted gap over the requirement span."""
+        weighted_gap = (self.gaps(levels) * self.importance).sum(axis=2)
+        span = ((self.required - LOW) * self.importance).sum(axis=1)
+        return 1.0 - weighted_gap / np.maximum(span, 1e-9)
+
+    def aptitude_row(self, scores: dict):
+        return np.array([scores.get(a) if isinstance(scores.get(a), (int, float)) else np.nan
+                         for a in self.aptitudes])
+
+    def development_areas(self, scores: dict, careers, top=3) -> dict:
+        """{career: [(skill, gap)]} largest importance-weighted gaps for the known careers."""
+        rows = [self.career_index[c] for c in careers if c in self.career_index]
+        if not rows:
+            return {}
+        gaps = self.gaps(self.skill_levels(self.aptitude_row(scores)))[0, rows]
+        priority = gaps * self.importance[rows]
+        areas = {}
+        for k, i in enumerate(rows):
+            order = np.argsort(-priority[k], kind="stable")[:top]
+            areas[self.careers[i]] = [(self.skills[j], float(gaps[k, j])) for j in order if gaps[k, j] > 0]
+        return areas
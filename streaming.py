@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Streaming output for AI counselor responses.
+
+Tokens are printed as they arrive instead of after the full completion, and
+time-to-first-token and total latency are recorded per response.
+"""
+
+import sys
+import threading
+import time
+
+import openai
+
+STREAM_TIMEOUT = 30.0  # seconds the API may take to answer a streaming request
+
+
+class LatencyLog:
+    """Time-to-first-token and total latency of streamed responses, in seconds."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self.first_token = []
+        self.total = []
+        self._lock = threading.Lock()
+
+    def record(self, first_token, total):
+        with self._lock:
+            if first_token is not None:
+                self.first_token = (self.first_token + [first_token])[-self.max_entries:]
+            self.total = (self.total + [total])[-self.max_entries:]
+
+    def summary(self) -> dict:
+        def pct(values, q):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+        with self._lock:
+            return {"responses": len(self.total),
+                    "ttft_p50": pct(self.first_token, 0.5), "ttft_p95": pct(self.first_token, 0.95),
+                    "total_p50": pct(self.total, 0.5), "total_p95": pct(self.total, 0.95)}
+
+    def summary_line(self) -> str:
+        """The summary as one readable line, e.g. for the end of a session."""
+        s = self.summary()
+        if not s["responses"]:
+            return "Streaming latency: no streamed responses"
+        ttft = (f"first token p50 {s['ttft_p50']:.2f}s / p95 {s['ttft_p95']:.2f}s, "
+                if s["ttft_p50"] is not None else "no tokens received, ")
+        return (f"Streaming latency over {s['responses']} responses: {ttft}"
+                f"total p50 {s['total_p50']:.2f}s / p95 {s['total_p95']:.2f}s")
+
+
+LATENCY_LOG = LatencyLog()
+
+
+def openai_token_stream(prompt, model="gpt-3.5-turbo", max_tokens=150, api_base=None, timeout=STREAM_TIMEOUT):
+    """Yield content tokens from an OpenAI (or OpenAI-compatible) streaming completion."""
+    kwargs = {"api_base": api_base} if api_base else {}
+    response = openai.ChatCompletion.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        stream=True,
+        request_timeout=timeout,
+        **kwargs
+    )
+    for chunk in response:
+        token = chunk.choices[0].delta.get("content")
+        if token:
+            yield token
+
+
+def stream_to_console(tokens, out=None, log=LATENCY_LOG, timeout=None):
+    """Print tokens as they arrive and return the full text.
+
+    Latency is recorded even if the stream fails part-way; the error is re-raised
+    so the caller can fall back. With a timeout, a stream still running after
+    that many seconds is abandoned with TimeoutError (a stalled read is bounded
+    by the backend's own request timeout).
+    """
+    out = out or sys.stdout
+    start = time.perf_counter()
+    first_token = None
+    parts = []
+    try:
+        for token in tokens:
+            if timeout is not None and time.perf_counter() - start > timeout:
+                close = getattr(tokens, "close", None)
+                if close:
+                    close()
+                raise TimeoutError(f"stream exceeded {timeout:.1f}s")
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            parts.append(token)
+            out.write(token)
+            out.flush()
+    finally:
+        log.record(first_token, time.perf_counter() - start)
+        if parts:
+            out.write("\n")
+            out.flush()
+    return "".join(parts).strip()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Synthetic respondents for load and scale testing.
+
+Each respondent belongs to a latent profile (by default one per career: the
+categories that map to the career score high). Category traits are drawn
+around the profile means with a shared general factor, so categories are
+correlated; item answers are the trait plus item noise, rounded onto the
+response scale, with reverse-keyed items flipped. Bipolar MBTI items lean
+towards the profile's type where the career is mapped from an MBTI_<TYPE>
+category, else towards a random type per respondent, so JSONL records
+carry an MBTI type and score like real sessions. Respondents are generated
+in fixed-size chunks and streamed to CSV, JSONL (session-store records) or
+NPY, so memory stays constant however many are written.
+
+Run `python synthetic_cohort.py N out.csv|out.jsonl|out.npy`.
+"""
+
+import csv
+import json
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from scoring import MBTI_AXES
+from session_model import get_schema
+from taxonomy import MBTI_CATEGORY_PREFIX, load_taxonomy
+
+CHUNK_ROWS = 50000
+HIGH_MEAN, BASE_MEAN = 4.2, 2.8  # latent category means inside / outside a profile
+CAREER_THRESHOLD = 4.0           # same cut-off as map_to_careers
+MBTI_LEAN = 1.0                  # distance of an MBTI item's mean from the scale midpoint
+
+
+def default_profiles(schema=None):
+    """[(career, category means)] with the categories mapping to each career raised."""
+    schema = schema or get_schema()
+    categories = schema.layout.categories
+    mapping = load_taxonomy().scoring_mapping()
+    profiles = []
+    for career in schema.careers:
+        means = np.array([HIGH_MEAN if career in mapping.get(c, []) else BASE_MEAN for c in categories])
+        if (means == HIGH_MEAN).any():
+            profiles.append((career, means))
+    return profiles
+
+
+def profile_leanings(profiles, mapping=None):
+    """(profiles, MBTI axes) array: +1 towards the second pole, -1 the first, 0 for no type."""
+    mapping = mapping or load_taxonomy().scoring_mapping()
+    leanings = np.zeros((len(profiles), len(MBTI_AXES)), dtype=np.int8)
+    for i, (career, _) in enumerate(profiles):
+        types = [c[len(MBTI_CATEGORY_PREFIX):] for c, careers in mapping.items()
+                 if c.startswith(MBTI_CATEGORY_PREFIX) and career in careers]
+        if types:
+            leanings[i] = [1 if letter == second else -1 for letter, (_, second) in zip(types[0], MBTI_AXES)]
+    return leanings
+
+
+class CohortGenerator:
+    """Chunks of synthetic int8 answer matrices over the taxonomy's Likert items."""
+
+    def __init__(self, profiles=None, weights=None, correlation=0.3, trait_sd=0.6, item_sd=0.7,
+                 items_per_category=None, seed=0, schema=None):
+        self.schema = schema or get_schema()
+        self.layout = self.schema.layout
+        self.profiles = profiles or default_profiles(self.schema)
+        self.means = np.array([m for _, m in self.profiles], dtype=np.float64)
+        self.leanings = profile_leanings(self.profiles)
+        weights = np.ones(len(self.profiles)) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.weights = weights / weights.sum()
+        self.correlation = correlation
+        self.trait_sd = trait_sd
+        self.item_sd = item_sd
+        self.items_per_category = items_per_category
+        self.rng = np.random.default_rng(seed)
+        self.category_items = [np.flatnonzero(self.layout.item_category == j)
+                               for j in range(len(self.layout.categories))]
+
+    def chunk(self, n):
+        """(answers (n, items) int8 with 0 = not asked, profile index per row)."""
+        rng, layout = self.rng, self.layout
+        profile = rng.choice(len(self.profiles), size=n, p=self.weights)
+        # Trait = profile mean + shared factor + category-specific part, all unit-free
+        general = rng.standard_normal((n, 1))
+        specific = rng.standard_normal((n, self.means.shape[1]))
+        traits = self.means[profile] + self.trait_sd * (
+            np.sqrt(self.correlation) * general + np.sqrt(1 - self.correlation) * specific)
+        raw = traits[:, layout.item_category] + self.item_sd * rng.standard_normal((n, len(layout.items)))
+        # MBTI items: the profile's type, or a random one, pulls answers to one pole per axis
+        lean = self.leanings[profile]
+        lean = np.where(lean == 0, rng.choice(np.array([-1, 1], dtype=np.int8), size=lean.shape), lean)
+        bipolar = np.flatnonzero(layout.mbti_axis >= 0)
+        raw[:, bipolar] = (layout.midpoint + MBTI_LEAN * lean[:, layout.mbti_axis[bipolar]]
+                           + self.item_sd * rng.standard_normal((n, len(bipolar))))
+        raw = np.where(layout.reverse, layout.low + layout.high - raw, raw)
+        answers = np.clip(np.rint(raw), layout.low, layout.high).astype(np.int8)
+        if self.items_per_category:
+            for items in self.category_items:
+                if len(items) > self.items_per_category:
+                    order = np.argsort(rng.random((n, len(items))), axis=1)
+                    answers[np.arange(n)[:, None], items[order[:, self.items_per_category:]]] = 0
+        return answers, profile
+
+    def chunks(self, n, chunk_rows=CHUNK_ROWS):
+        for start in range(0, n, chunk_rows):
+            yield self.chunk(min(chunk_rows, n - start))
+
+    def scores(self, answers):
+        """Keyed category means of an answer chunk (NaN where a category was not asked)."""
+        return self.layout.category_means(self._matrix(answers))
+
+    def mbti(self, answers):
+        """MBTI types and preference clarity of an answer chunk, as the scorer computes them."""
+        return self.layout.mbti(self._matrix(answers))
+
+    @staticmethod
+    def _matrix(answers):
+        matrix = answers.astype(np.float64)
+        matrix[answers == 0] = np.nan
+        return matrix
+
+
+def write_csv(generator, n, path, scale=None):
+    """One row per respondent, one column per question; with a scale, answers are written as its labels."""
+    label_of = np.array([""] + [str(v) for v in range(1, generator.layout.high + 1)], dtype=object)
+    for label, value in (scale or {}).items():
+        label_of[value] = label
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["profile"] + generator.layout.items)
+        for answers, profile in generator.chunks(n):
+            cells = label_of[answers]
+            names = [generator.profiles[p][0] for p in profile]
+            writer.writerows([name] + row for name, row in zip(names, cells.tolist()))
+
+
+def write_jsonl(generator, n, path):
+    """Session-store records: {"q1": scores, "q2": careers over the threshold, "chosen": profile career}.
+
+    q1 includes the MBTI type and its MBTI_<TYPE> score like score_likert_layer; q2 is
+    ranked like map_to_careers, strongest category score first.
+    """
+    layout = generator.layout
+    mapping = load_taxonomy().scoring_mapping()
+    with open(path, "w", encoding="utf-8") as f:
+        for answers, profile in generator.chunks(n):
+            scores = np.round(generator.scores(answers), 4)
+            types, clarity = generator.mbti(answers)
+            type_scores = np.round(layout.midpoint + clarity * (layout.high - layout.midpoint), 4)
+            lines = []
+            for row, mbti_type, type_score, p in zip(scores, types, type_scores, profile):
+                q1 = {c: float(v) for c, v in zip(layout.categories, row) if v == v}
+                q1["MBTI"] = str(mbti_type)
+                if "X" not in mbti_type:
+                    q1[f"MBTI_{mbti_type}"] = float(type_score)
+                best = {}
+                for c, v in q1.items():
+                    if isinstance(v, float) and v >= CAREER_THRESHOLD:
+                        for career in mapping.get(c, []):
+                            best[career] = max(best.get(career, v), v)
+                careers = sorted(best, key=lambda career: (-best[career], career))
+                lines.append(json.dumps({"q1": q1, "q2": careers, "chosen": generator.profiles[p][0]}))
+            f.write("\n".join(lines) + "\n")
+
+
+def write_npy(generator, n, path):
+    """(n, items) int8 answer matrix written through a memory map, plus <path>.profiles.npy."""
+    answers_out = open_memmap(path, mode="w+", dtype=np.int8, shape=(n, len(generator.layout.items)))
+    profiles_out = open_memmap(path[:-4] + ".profiles.npy", mode="w+", dtype=np.int32, shape=(n,))
+    start = 0
+    for answers, profile in generator.chunks(n):
+        answers_out[start:start + len(answers)] = answers
+        profiles_out[start:start + len(answers)] = profile
+        start += len(answers)
+    answers_out.flush()
+    profiles_out.flush()
+
+
+WRITERS = {".csv": write_csv, ".jsonl": write_jsonl, ".npy": write_npy}
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    if len(sys.argv) < 3:
+        sys.exit("usage: python synthetic_cohort.py N out.csv|out.jsonl|out.npy")
+    count, out_path = int(sys.argv[1]), sys.argv[2]
+    writer = WRITERS.get(os.path.splitext(out_path)[1])
+    if writer is None:
+        sys.exit(f"Unknown output format: {out_path}")
+    writer(CohortGenerator(), count, out_path)
+    print(f"Wrote {count} synthetic respondents to {out_path}")
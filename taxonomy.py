@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Career taxonomy and question banks compiled from versioned data files.
+
+taxonomy/questions.json and taxonomy/careers.json are the source of truth.
+compile_taxonomy() validates them and writes taxonomy/taxonomy.npz: one
+string table plus int32 CSR index arrays, loaded without pickle. Every
+script and tool loads the same artifact through load_taxonomy(), which
+recompiles only when the sources have changed.
+
+Run `python taxonomy.py` to validate and compile.
+"""
+
+import functools
+import hashlib
+import json
+import os
+
+import numpy as np
+
+TAXONOMY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomy")
+QUESTIONS_PATH = os.path.join(TAXONOMY_DIR, "questions.json")
+CAREERS_PATH = os.path.join(TAXONOMY_DIR, "careers.json")
+ARTIFACT_PATH = os.path.join(TAXONOMY_DIR, "taxonomy.npz")
+SOURCE_PATHS = [QUESTIONS_PATH, CAREERS_PATH, ARTIFACT_PATH]
+MBTI_CATEGORY_PREFIX = "MBTI_"
+_SEP = "\x1f"  # joins layer and category names in the string table
+
+
+class TaxonomyError(ValueError):
+    """The taxonomy data files are inconsistent."""
+
+
+def _read_sources(questions_path=QUESTIONS_PATH, careers_path=CAREERS_PATH):
+    with open(questions_path, "rb") as f:
+        raw_questions = f.read()
+    with open(careers_path, "rb") as f:
+        raw_careers = f.read()
+    digest = hashlib.sha1(raw_questions + b"\0" + raw_careers).hexdigest()
+    return json.loads(raw_questions), json.loads(raw_careers), digest
+
+
+def validate(questions: dict, careers: dict) -> list:
+    """Every problem found in the sources, as readable messages."""
+    problems = []
+    if questions.get("version") != careers.get("version"):
+        problems.append(f"version mismatch: questions {questions.get('version')} vs careers {careers.get('version')}")
+    all_items = set()
+    question_categories = set()
+    for layer, categories in questions["layers"].items():
+        for category, items in categories.items():
+            question_categories.add(category)
+            if not items:
+                problems.append(f"{layer}/{category}: no questions")
+            all_items.update(items)
+    for item in questions.get("reverse_keyed_items", []):
+        if item not in all_items:
+            problems.append(f"reverse-keyed item not in any layer: {item!r}")
+    for item in questions.get("mbti_items", {}):
+        if item not in all_items:
+            problems.append(f"MBTI item not in any layer: {item!r}")
+    for layer in questions.get("open_ended_layers", []):
+        if layer not in questions["layers"]:
+            problems.append(f"open-ended layer does not exist: {layer}")
+    for name, scale in questions["response_scales"].items():
+        if sorted(scale.values()) != list(range(1, len(scale) + 1)):
+            problems.append(f"response scale {name}: values must be 1..{len(scale)}")
+
+    mapping = careers["career_mapping"]
+    aliases = careers.get("category_aliases", {})
+    unscored = set(careers.get("unscored_categories", []))
+    for source, target in aliases.items():
+        if source not in question_categories:
+            problems.append(f"alias source is not a question category: {source}")
+        if target not in mapping:
+            problems.append(f"alias target is not a mapped category: {target}")
+    scored = question_categories | set(aliases.values())
+    for category in mapping:
+        if category not in scored and category not in unscored and not category.startswith(MBTI_CATEGORY_PREFIX):
+            problems.append(f"mapped category is not produced by any question category: {category}")
+    for category in unscored:
+        if category not in mapping:
+            problems.append(f"unscored category is not mapped: {category}")
+    keywords = careers.get("category_keywords", {})
+    for category in mapping:
+        if not str(keywords.get(category, "")).strip():
+            problems.append(f"mapped category has no keywords: {category}")
+    for category in keywords:
+        if category not in mapping:
+            problems.append(f"keywords for a category that is not mapped: {category}")
+    skills = careers.get("skills", [])
+    if len(set(skills)) != len(skills):
+        problems.append("skills are listed more than once")
+    known_skills = set(skills)
+    for aptitude, weights in careers.get("aptitude_skills", {}).items():
+        if aptitude not in question_categories:
+            problems.append(f"aptitude is not a question category: {aptitude}")
+        for skill, weight in weights.items():
+            if skill not in known_skills:
+                problems.append(f"{aptitude}: unknown skill {skill!r}")
+            if not isinstance(weight, (int, float)) or weight <= 0:
+                problems.append(f"{aptitude}: weight for {skill} must be a positive number")
+    category_skills = careers.get("category_skills", {})
+    for category in mapping:
+        if not category_skills.get(category):
+            problems.append(f"mapped category has no skills: {category}")
+    for category, listed in category_skills.items():
+        if category not in mapping:
+            problems.append(f"skills for a category that is not mapped: {category}")
+        for skill in listed:
+            if skill not in known_skills:
+                problems.append(f"{category}: unknown skill {skill!r}")
+    for name, skill in careers.get("skill_aliases", {}).items():
+        if skill not in known_skills:
+            problems.append(f"skill alias {name!r} points to an unknown skill: {skill}")
+    soc_codes = careers.get("soc_codes", {})
+    all_careers = {c for cs in mapping.values() for c in cs} | set(careers.get("onet_data", {}))
+    for career in sorted(all_careers):
+        if career not in soc_codes:
+            problems.append(f"career has no O*NET-SOC code: {career}")
+    for career, code in soc_codes.items():
+        if len(code) != 10 or code[2] != "-" or code[7] != ".":
+            problems.append(f"malformed O*NET-SOC code for {career}: {code}")
+    return problems
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def id(self, text):
+        if text not in self.index:
+            self.index[text] = len(self.strings)
+            self.strings.append(text)
+        return self.index[text]
+
+
+def _csr(table, groups):
+    """Keys and CSR arrays for an ordered {key: [strings]} dict."""
+    keys = [table.id(k) for k in groups]
+    indptr = np.cumsum([0] + [len(v) for v in groups.values()]).astype(np.int32)
+    values = np.array([table.id(x) for v in groups.values() for x in v], dtype=np.int32)
+    return np.array(keys, dtype=np.int32), indptr, values
+
+
+def compile_taxonomy(questions_path=QUESTIONS_PATH, careers_path=CAREERS_PATH, artifact_path=ARTIFACT_PATH):
+    """Validate the sources and write the binary artifact; raises TaxonomyError on problems."""
+    questions, careers, digest = _read_sources(questions_path, careers_path)
+    problems = validate(questions, careers)
+    if problems:
+        raise TaxonomyError("Invalid taxonomy:\n  " + "\n  ".join(problems))
+    table = _StringTable()
+    arrays = {}
+
+    layer_categories = {layer: list(cats) for layer, cats in questions["layers"].items()}
+    arrays["layer_keys"], arrays["layer_indptr"], arrays["layer_values"] = _csr(table, layer_categories)
+    category_items = {}
+    for layer, cats in questions["layers"].items():
+        for category, items in cats.items():
+            category_items[f"{layer}{_SEP}{category}"] = items
+    arrays["cat_keys"], arrays["cat_indptr"], arrays["cat_values"] = _csr(table, category_items)
+    arrays["scale_keys"], arrays["scale_indptr"], arrays["scale_labels"] = _csr(
+        table, {name: list(scale) for name, scale in questions["response_scales"].items()})
+    arrays["scale_values"] = np.array([v for scale in questions["response_scales"].values() for v in scale.values()],
+                                      dtype=np.int8)
+    arrays["open_ended"] = np.array([table.id(x) for x in questions.get("open_ended_layers", [])], dtype=np.int32)
+    arrays["reverse_keyed"] = np.array([table.id(x) for x in questions.get("reverse_keyed_items", [])], dtype=np.int32)
+    arrays["mbti_keys"], arrays["mbti_indptr"], arrays["mbti_poles"] = _csr(table, questions.get("mbti_items", {}))
+
+    arrays["map_keys"], arrays["map_indptr"], arrays["map_values"] = _csr(table, careers["career_mapping"])
+    arrays["alias_from"], _, arrays["alias_to"] = _csr(
+        table, {k: [v] for k, v in careers.get("category_aliases", {}).items()})
+    arrays["unscored"] = np.array([table.id(x) for x in careers.get("unscored_categories", [])], dtype=np.int32)
+    arrays["keyword_keys"], _, arrays["keyword_values"] = _csr(
+        table, {k: [v] for k, v in careers.get("category_keywords", {}).items()})
+    arrays["skills"] = np.array([table.id(x) for x in careers.get("skills", [])], dtype=np.int32)
+    aptitude_skills = careers.get("aptitude_skills", {})
+    arrays["aptitude_keys"], arrays["aptitude_indptr"], arrays["aptitude_skills"] = _csr(
+        table, {a: list(weights) for a, weights in aptitude_skills.items()})
+    arrays["aptitude_weights"] = np.array([w for weights in aptitude_skills.values() for w in weights.values()],
+                                          dtype=np.float64)
+    arrays["catskill_keys"], arrays["catskill_indptr"], arrays["catskill_values"] = _csr(
+        table, careers.get("category_skills", {}))
+    arrays["skill_alias_from"], _, arrays["skill_alias_to"] = _csr(
+        table, {k: [v] for k, v in careers.get("skill_aliases", {}).items()})
+    onet = careers.get("onet_data", {})
+    arrays["onet_keys"], arrays["onet_indptr"], arrays["onet_skills"] = _csr(
+        table, {c: info.get("skills", []) for c, info in onet.items()})
+    arrays["onet_outlook"] = np.array([table.id(info.get("outlook", "N/A")) for info in onet.values()], dtype=np.int32)
+    arrays["soc_keys"], _, arrays["soc_values"] = _csr(table, {c: [code] for c, code in careers.get("soc_codes", {}).items()})
+
+    arrays["strings"] = np.array(table.strings, dtype=str)
+    arrays["meta"] = np.array([questions["version"], digest], dtype=str)
+    tmp_path = artifact_path + ".tmp.npz"
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, artifact_path)
+    return artifact_path
+
+
+def _groups(strings, keys, indptr, values):
+    return {strings[k]: [strings[v] for v in values[indptr[i]:indptr[i + 1]]] for i, k in enumerate(keys)}
+
+
+class Taxonomy:
+    """Question banks, response scales, career mapping, skill tables and O*NET data from the artifact."""
+
+    def __init__(self, artifact_path=ARTIFACT_PATH):
+        with np.load(artifact_path, allow_pickle=False) as data:
+            a = {k: data[k] for k in data.files}
+        s = a["strings"].tolist()
+        self.version, self.digest = a["meta"].tolist()
+        categories = _groups(s, a["layer_keys"], a["layer_indptr"], a["layer_values"])
+        items = _groups(s, a["cat_keys"], a["cat_indptr"], a["cat_values"])
+        self.layers = {layer: {c: items[f"{layer}{_SEP}{c}"] for c in cats} for layer, cats in categories.items()}
+        self.open_ended_layers = [s[i] for i in a["open_ended"]]
+        labels = _groups(s, a["scale_keys"], a["scale_indptr"], a["scale_labels"])
+        values = a["scale_values"].tolist()
+        self.response_scales = {}
+        for i, (name, scale_labels) in enumerate(labels.items()):
+            start = int(a["scale_indptr"][i])
+            self.response_scales[name] = dict(zip(scale_labels, values[start:start + len(scale_labels)]))
+        self.reverse_keyed_items = {s[i] for i in a["reverse_keyed"]}
+        self.mbti_items = {q: tuple(poles) for q, poles in _groups(s, a["mbti_keys"], a["mbti_indptr"], a["mbti_poles"]).items()}
+        self.career_mapping = _groups(s, a["map_keys"], a["map_indptr"], a["map_values"])
+        self.category_aliases = {s[k]: s[v] for k, v in zip(a["alias_from"], a["alias_to"])}
+        self.unscored_categories = [s[i] for i in a["unscored"]]
+        self.category_keywords = {s[k]: s[v] for k, v in zip(a["keyword_keys"], a["keyword_values"])}
+        self.skills = [s[i] for i in a["skills"]]
+        weights = a["aptitude_weights"].tolist()
+        self.aptitude_skills = {}
+        for i, (aptitude, names) in enumerate(_groups(s, a["aptitude_keys"], a["aptitude_indptr"],
+                                                      a["aptitude_skills"]).items()):
+            start = int(a["aptitude_indptr"][i])
+            self.aptitude_skills[aptitude] = dict(zip(names, weights[start:start + len(names)]))
+        self.category_skills = _groups(s, a["catskill_keys"], a["catskill_indptr"], a["catskill_values"])
+        self.skill_aliases = {s[k]: s[v] for k, v in zip(a["skill_alias_from"], a["skill_alias_to"])}
+        skills = _groups(s, a["onet_keys"], a["onet_indptr"], a["onet_skills"])
+        self.onet_data = {c: {"skills": sk, "outlook": s[o]} for (c, sk), o in zip(skills.items(), a["onet_outlook"])}
+        self.soc_codes = {s[k]: s[v] for k, v in zip(a["soc_keys"], a["soc_values"])}
+
+    def scoring_mapping(self) -> dict:
+        """Career mapping that also answers to the question-category names (e.g. "Musical Intelligence")."""
+        mapping = dict(self.career_mapping)
+        for source, target in self.category_aliases.items():
+            mapping[source] = self.career_mapping[target]
+        return mapping
+
+    def scoring_keywords(self) -> dict:
+        """Category keywords under the same names as scoring_mapping(), aliases included."""
+        keywords = dict(self.category_keywords)
+        for source, target in self.category_aliases.items():
+            keywords[source] = self.category_keywords.get(target, "")
+        return keywords
+
+
+def _artifact_is_current(artifact_path=ARTIFACT_PATH):
+    if not os.path.exists(artifact_path):
+        return False
+    if not (os.path.exists(QUESTIONS_PATH) and os.path.exists(CAREERS_PATH)):
+        return True  # deployed with the artifact only
+    _, _, digest = _read_sources()
+    with np.load(artifact_path, allow_pickle=False) as data:
+        return data["meta"].tolist()[1] == digest
+
+
+def reload_taxonomy(artifact_path=ARTIFACT_PATH) -> Taxonomy:
+    """A fresh Taxonomy from the current files (recompiled if stale), bypassing the load_taxonomy() cache."""
+    if not _artifact_is_current(artifact_path):
+        compile_taxonomy(artifact_path=artifact_path)
+    return Taxonomy(artifact_path)
+
+
+@functools.lru_cache(maxsize=None)
+def load_taxonomy(artifact_path=ARTIFACT_PATH) -> Taxonomy:
+    """The compiled taxonomy, recompiling first if the data files changed."""
+    if artifact_path == ARTIFACT_PATH and not _artifact_is_current(artifact_path):
+        compile_taxonomy(artifact_path=artifact_path)
+    return Taxonomy(artifact_path)
+
+
+if __name__ == "__main__":
+    path = compile_taxonomy()
+    taxonomy = Taxonomy(path)
+    print(f"Compiled taxonomy {taxonomy.version} ({len(taxonomy.career_mapping)} mapped categories, "
+          f"{len(taxonomy.soc_codes)} careers) to {path}")
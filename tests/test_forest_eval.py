@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forest_eval import CompiledForest, export_forest
+
+
+class CompiledForestTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.X = np.round(rng.uniform(1, 5, (400, 6)), 1)
+        cls.y = np.array(["Law", "Nursing", "Software"])[(cls.X[:, 0] + cls.X[:, 3] > 6).astype(int)
+                                                         + (cls.X[:, 1] > 4).astype(int)]
+        cls.model = RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0).fit(cls.X, cls.y)
+
+    def test_matches_sklearn(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            forest = export_forest(self.model, os.path.join(tmp, "forest"))
+            np.testing.assert_allclose(forest.predict_proba(self.X), self.model.predict_proba(self.X))
+            np.testing.assert_array_equal(forest.predict(self.X), self.model.predict(self.X))
+            reloaded = CompiledForest(os.path.join(tmp, "forest"), mmap=False)
+            np.testing.assert_array_equal(reloaded.predict(self.X[:50]), self.model.predict(self.X[:50]))
+
+    def test_predict_one_uses_columns(self):
+        columns = [f"c{j}" for j in range(self.X.shape[1])]
+        with tempfile.TemporaryDirectory() as tmp:
+            forest = export_forest(self.model, os.path.join(tmp, "forest"), columns)
+            row = self.X[7]
+            scores = {c: float(v) for c, v in reversed(list(zip(columns, row)))}
+            self.assertEqual(forest.predict_one(scores), self.model.predict(row[None, :])[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from norms import CategoryNorms, map_to_careers_by_percentile
+
+
+class CategoryNormsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.matrix = np.round(rng.uniform(1, 5, (2000, 2)), 2)
+        cls.matrix[::3, 1] = np.nan  # unanswered in a third of the sessions
+
+    def _norms(self, matrix):
+        norms = CategoryNorms([])
+        norms.update(["Linguistic", "Musical"], matrix)
+        return norms
+
+    def test_percentiles_match_the_cohort(self):
+        norms = self._norms(self.matrix)
+        for value in (1.5, 2.0, 3.0, 4.2, 4.9):
+            pct = norms.percentiles({"Linguistic": value, "Musical": value, "MBTI": "INTP"})
+            self.assertEqual(set(pct), {"Linguistic", "Musical"})
+            for j, category in enumerate(["Linguistic", "Musical"]):
+                column = self.matrix[:, j][~np.isnan(self.matrix[:, j])]
+                self.assertAlmostEqual(pct[category], 100 * np.mean(column <= value), delta=1.5)
+        self.assertEqual(norms.percentiles({"Linguistic": 5.0})["Linguistic"], 100.0)
+        self.assertEqual(norms.percentiles({"Linguistic": 4}), norms.percentiles({"Linguistic": 4.0}))
+        self.assertEqual(norms.n_sessions, 2000)
+
+    def test_merge_and_reload_keep_percentiles(self):
+        whole = self._norms(self.matrix)
+        merged = self._norms(self.matrix[:1000])
+        merged.merge(self._norms(self.matrix[1000:]))
+        scores = {"Linguistic": 3.3, "Musical": 2.7}
+        self.assertEqual(merged.percentiles(scores), whole.percentiles(scores))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "norms.npz")
+            whole.save(path)
+            reloaded = CategoryNorms.load(path)
+        self.assertEqual(reloaded.percentiles(scores), whole.percentiles(scores))
+        self.assertEqual(reloaded.version, whole.version)
+
+    def test_map_to_careers_by_percentile(self):
+        mapping = {"Linguistic": ["Journalism"], "Musical": ["Music Production"]}
+        self.assertEqual(map_to_careers_by_percentile({"Linguistic": 85.0, "Musical": 60.0}, mapping),
+                         ["Journalism"])
+
+
+if __name__ == "__main__":
+    unittest.main()
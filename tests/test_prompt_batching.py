@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_batching import FakeBackend, PromptBatcher, batch_items, build_batch_prompt, split_batch_reply
+
+WAIT = 5.0  # generous upper bound for futures in these tests
+
+
+class BatchFormatTest(unittest.TestCase):
+    def test_batch_items_round_trip(self):
+        prompts = ["Explain A", "Explain\n  B"]
+        self.assertEqual(batch_items(build_batch_prompt(prompts)), ["Explain A", "Explain B"])
+        self.assertIsNone(batch_items("Explain A"))
+
+    def test_split_json_and_numbered_replies(self):
+        self.assertEqual(split_batch_reply('Sure: ["a", "b"]', 2), ["a", "b"])
+        self.assertEqual(split_batch_reply("1. a\n2) b", 2), ["a", "b"])
+        self.assertIsNone(split_batch_reply('["a"]', 2))
+
+
+class PromptBatcherTest(unittest.TestCase):
+    def test_window_flush_sends_one_batch(self):
+        backend = FakeBackend()
+        batcher = PromptBatcher(backend, window=0.05, max_items=10)
+        futures = [batcher.submit(f"prompt {i}") for i in range(3)]
+        answers = [f.result(WAIT) for f in futures]
+        self.assertEqual(answers, [f"[fake answer] prompt {i}" for i in range(3)])
+        self.assertEqual(len(backend.calls), 1)
+        self.assertEqual(batcher.calls, 1)
+
+    def test_max_items_flushes_without_waiting_for_the_window(self):
+        backend = FakeBackend()
+        batcher = PromptBatcher(backend, window=60.0, max_items=2)
+        first = [batcher.submit("a"), batcher.submit("b")]
+        self.assertEqual([f.result(WAIT) for f in first], ["[fake answer] a", "[fake answer] b"])
+        third = batcher.submit("c")
+        self.assertFalse(third.done())
+        batcher.flush()
+        self.assertEqual(third.result(WAIT), "[fake answer] c")
+        self.assertEqual(len(backend.calls), 2)
+
+    def test_single_prompt_is_sent_without_batch_header(self):
+        backend = FakeBackend()
+        batcher = PromptBatcher(backend, window=60.0)
+        self.assertEqual(batcher.ask_many(["only"], WAIT), ["[fake answer] only"])
+        self.assertEqual(backend.calls, ["only"])
+
+    def test_answers_fan_out_to_concurrent_callers(self):
+        backend = FakeBackend()
+        batcher = PromptBatcher(backend, window=0.2, max_items=100)
+        results = {}
+        barrier = threading.Barrier(8)
+
+        def caller(i):
+            barrier.wait()
+            results[i] = batcher.ask(f"question {i}", WAIT)
+
+        threads = [threading.Thread(target=caller, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(WAIT)
+        self.assertEqual(results, {i: f"[fake answer] question {i}" for i in range(8)})
+        self.assertEqual(batcher.prompts, 8)
+        self.assertLess(batcher.calls, 8)
+        self.assertEqual(batcher.calls, len(backend.calls))
+
+    def test_unsplittable_reply_falls_back_to_one_call_per_prompt(self):
+        sent = []
+
+        def send(prompt, max_tokens, timeout=None):
+            sent.append(prompt)
+            return "no idea" if batch_items(prompt) is not None else f"answer to {prompt}"
+
+        batcher = PromptBatcher(send, window=60.0)
+        self.assertEqual(batcher.ask_many(["a", "b"], WAIT), ["answer to a", "answer to b"])
+        self.assertEqual(len(sent), 3)
+        self.assertEqual(batcher.calls, 3)
+
+    def test_backend_error_reaches_every_caller(self):
+        def send(prompt, max_tokens, timeout=None):
+            raise RuntimeError("model down")
+
+        batcher = PromptBatcher(send, window=60.0)
+        futures = [batcher.submit("a"), batcher.submit("b")]
+        batcher.flush()
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(WAIT)
+
+    def test_request_timeout_is_the_longest_remaining_wait(self):
+        timeouts = []
+
+        def send(prompt, max_tokens, timeout=None):
+            timeouts.append(timeout)
+            return FakeBackend()(prompt, max_tokens)
+
+        batcher = PromptBatcher(send, window=60.0)
+        short, long = batcher.submit("a", timeout=1.0), batcher.submit("b", timeout=3.0)
+        batcher.flush()
+        short.result(WAIT), long.result(WAIT)
+        self.assertEqual(len(timeouts), 1)
+        self.assertTrue(2.0 < timeouts[0] <= 3.0)
+        self.assertEqual(batcher.ask_many(["c"]), ["[fake answer] c"])
+        self.assertIsNone(timeouts[-1])
+
+    def test_window_timer_fires_once_per_batch(self):
+        backend = FakeBackend()
+        batcher = PromptBatcher(backend, window=0.05)
+        batcher.submit("a").result(WAIT)
+        time.sleep(0.1)
+        batcher.submit("b").result(WAIT)
+        self.assertEqual(len(backend.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recommendation_cache import RecommendationCache
+from resilience import FallbackTracker, guarded_call
+
+SCORES = {"Linguistic": 4.2, "MBTI": "INTP"}
+
+
+class RecommendationCacheTest(unittest.TestCase):
+    def test_declined_results_are_recomputed(self):
+        cache = RecommendationCache(path=None)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "text"
+
+        for _ in range(2):
+            with FallbackTracker() as fallbacks:
+                guarded_call("test-dependency", lambda: None, lambda: "fallback")
+                cache.get_or_compute("ai", SCORES, compute, keep=lambda _: not fallbacks.degraded)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(cache.entries), 0)
+        cache.get_or_compute("ai", SCORES, compute)
+        cache.get_or_compute("ai", SCORES, compute)
+        self.assertEqual(len(calls), 3)
+
+    def test_saved_as_json_and_reloaded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.json")
+            cache = RecommendationCache(path=path)
+            cache.get_or_compute("careers", SCORES, lambda: ["Journalism", "Law"], "ranked")
+            cache.save()
+            reloaded = RecommendationCache(path=path)
+            reloaded.load()
+            self.assertEqual(reloaded.get_or_compute("careers", SCORES, lambda: [], "ranked"), ["Journalism", "Law"])
+            self.assertEqual(reloaded.stats()["namespaces"]["careers"]["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Local matching of open-ended Layer 6 answers to careers.
+
+Every career in CAREER_MAPPING/ONET_DATA gets a short description built from
+its name, the categories that map to it, their keywords from the taxonomy
+and its O*NET skills. The TF-IDF vectors of those descriptions are fitted
+once and cached with joblib, so scoring a student's answers against every
+career is one sparse matrix product and never calls the OpenAI API.
+"""
+
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+CACHE_PATH = "career_text_index.pkl"
+MIN_SIMILARITY = 0.1
+
+
+def career_descriptions(mapping: dict, onet_data: dict, keywords=None) -> dict:
+    """One description string per career from the mapping, category keywords and O*NET data.
+
+    keywords maps categories to plain-language hints (the taxonomy's
+    scoring_keywords(), which covers aliased category names too); each
+    hint is added to a career once however many categories carry it.
+    """
+    keywords = keywords or {}
+    parts = {}
+    for category, careers in mapping.items():
+        hints = [category.replace("_", " "), keywords.get(category, "")]
+        for career in careers:
+            seen = parts.setdefault(career, [career])
+            seen.extend(h for h in hints if h and h not in seen)
+    descriptions = {career: " ".join(hints) for career, hints in parts.items()}
+    for career, info in onet_data.items():
+        extra = " ".join(info.get("skills", [])) + " " + info.get("outlook", "")
+        descriptions[career] = f"{descriptions.get(career, career)} {extra}"
+    return descriptions
+
+
+class CareerTextMatcher:
+    """TF-IDF index of career descriptions with a cached fit."""
+
+    def __init__(self, mapping: dict, onet_data: dict, keywords=None, cache_path=CACHE_PATH):
+        descriptions = career_descriptions(mapping, onet_data, keywords)
+        digest = hashlib.sha1(json.dumps(descriptions, sort_keys=True).encode()).hexdigest()
+        cached = joblib.load(cache_path) if cache_path and os.path.exists(cache_path) else None
+        if cached and cached["digest"] == digest:
+            self.careers, self.vectorizer, self.matrix = cached["careers"], cached["vectorizer"], cached["matrix"]
+            return
+        self.careers = list(descriptions)
+        self.vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), sublinear_tf=True)
+        self.matrix = self.vectorizer.fit_transform([descriptions[c] for c in self.careers])
+        if cache_path:
+            joblib.dump({"digest": digest, "careers": self.careers,
+                         "vectorizer": self.vectorizer, "matrix": self.matrix}, cache_path)
+
+    def similarities(self, texts):
+        """(texts, careers) cosine similarity array in one sparse product."""
+        return (self.vectorizer.transform(texts) @ self.matrix.T).toarray()
+
+    def match(self, text: str, top=5) -> list:
+        """Best-matching (career, similarity) pairs for one block of free text."""
+        if not text or not text.strip():
+            return []
+        sims = self.similarities([text])[0]
+        order = np.argsort(-sims)[:top]
+        return [(self.careers[i], float(sims[i])) for i in order if sims[i] >= MIN_SIMILARITY]